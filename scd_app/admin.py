@@ -3,9 +3,57 @@ Django admin configuration for SCD models
 """
 
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import ExpressionWrapper, F, FloatField
+from django.utils.functional import cached_property
 from .models import Job, Timelog, PaymentLineItem, Company, Contractor
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids COUNT(*) on large, unfiltered SCD tables.
+    
+    On PostgreSQL and MySQL the planner's row estimate is used instead of an
+    exact count. Filtered querysets, small tables and other backends fall
+    back to the regular count.
+    """
+    exact_count_threshold = 10000
+    
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
+    
+    def _estimated_count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query') or queryset.query.has_filters():
+            return None
+        
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            sql = "SELECT reltuples::BIGINT FROM pg_class WHERE relname = %s"
+        elif connection.vendor == 'mysql':
+            sql = (
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s"
+            )
+        else:
+            return None
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+        
+        # reltuples is -1 for tables that have never been analyzed
+        if row is None or row[0] is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
     list_display = ['id', 'name', 'email', 'created_at']
@@ -20,11 +68,32 @@ class ContractorAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at']
 
 
+class SCDModelAdmin(admin.ModelAdmin):
+    """
+    Base admin for SCD models.
+    
+    The change list only loads the columns named in list_only_fields so wide
+    text columns are not fetched for every version row. Identifier columns
+    are searched with exact ("=") lookups so they can use their indexes.
+    """
+    list_only_fields = ()
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if self.list_only_fields and match and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.list_only_fields)
+        return queryset
+
+
 @admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
+class JobAdmin(SCDModelAdmin):
     list_display = ['id', 'version', 'uid', 'title', 'status', 'rate', 'company_id', 'contractor_id', 'created_at']
+    list_only_fields = ['id', 'version', 'uid', 'title', 'status', 'rate', 'company_id', 'contractor_id', 'created_at']
     list_filter = ['status', 'created_at']
-    search_fields = ['id', 'uid', 'title', 'company_id', 'contractor_id']
+    search_fields = ['=id', '=uid', 'title', '=company_id', '=contractor_id']
     readonly_fields = ['uid', 'created_at', 'updated_at']
     ordering = ['-created_at', 'id', '-version']
     
@@ -46,27 +115,45 @@ class JobAdmin(admin.ModelAdmin):
 
 
 @admin.register(Timelog)
-class TimelogAdmin(admin.ModelAdmin):
-    list_display = ['id', 'version', 'uid', 'duration_hours', 'type', 'job_uid', 'created_at']
+class TimelogAdmin(SCDModelAdmin):
+    list_display = ['id', 'version', 'uid', 'duration_hours', 'type', 'job', 'created_at']
+    list_only_fields = [
+        'id', 'version', 'uid', 'duration', 'type', 'job', 'created_at',
+        'job__id', 'job__version', 'job__title', 'job__status',
+    ]
+    list_select_related = ['job']
     list_filter = ['type', 'created_at']
-    search_fields = ['id', 'uid', 'job_uid']
-    readonly_fields = ['uid', 'created_at', 'updated_at', 'duration_hours']
+    search_fields = ['=id', '=uid', '=job__uid']
+    raw_id_fields = ['job']
+    readonly_fields = ['uid', 'created_at', 'updated_at', 'duration_hours', 'start_datetime', 'end_datetime']
     ordering = ['-created_at', 'id', '-version']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _duration_hours=ExpressionWrapper(F('duration') / 3600000.0, output_field=FloatField())
+        )
+    
     def duration_hours(self, obj):
-        """Convert duration from milliseconds to hours"""
-        return round(obj.duration / (1000 * 60 * 60), 2)
+        """Duration in hours, computed by the database in get_queryset()"""
+        hours = getattr(obj, '_duration_hours', None)
+        if hours is None:
+            return None
+        return round(hours, 2)
     duration_hours.short_description = 'Duration (hours)'
+    duration_hours.admin_order_field = '_duration_hours'
     
     fieldsets = (
         ('SCD Fields', {
             'fields': ('id', 'version', 'uid')
         }),
         ('Time Details', {
-            'fields': ('duration', 'duration_hours', 'time_start', 'time_end', 'type')
+            'fields': (
+                'duration', 'duration_hours', 'time_start', 'start_datetime',
+                'time_end', 'end_datetime', 'type'
+            )
         }),
         ('Relationships', {
-            'fields': ('job_uid',)
+            'fields': ('job',)
         }),
         ('Additional', {
             'fields': ('description',),
@@ -80,10 +167,16 @@ class TimelogAdmin(admin.ModelAdmin):
 
 
 @admin.register(PaymentLineItem)
-class PaymentLineItemAdmin(admin.ModelAdmin):
-    list_display = ['id', 'version', 'uid', 'amount', 'status', 'job_uid', 'payment_date', 'created_at']
+class PaymentLineItemAdmin(SCDModelAdmin):
+    list_display = ['id', 'version', 'uid', 'amount', 'status', 'job', 'payment_date', 'created_at']
+    list_only_fields = [
+        'id', 'version', 'uid', 'amount', 'status', 'job', 'payment_date', 'created_at',
+        'job__id', 'job__version', 'job__title', 'job__status',
+    ]
+    list_select_related = ['job']
     list_filter = ['status', 'payment_date', 'created_at']
-    search_fields = ['id', 'uid', 'job_uid', 'timelog_uid']
+    search_fields = ['=id', '=uid', '=job__uid', '=timelog__uid']
+    raw_id_fields = ['job', 'timelog']
     readonly_fields = ['uid', 'created_at', 'updated_at']
     ordering = ['-created_at', 'id', '-version']
     
@@ -95,7 +188,7 @@ class PaymentLineItemAdmin(admin.ModelAdmin):
             'fields': ('amount', 'status', 'payment_date')
         }),
         ('Relationships', {
-            'fields': ('job_uid', 'timelog_uid')
+            'fields': ('job', 'timelog')
         }),
         ('Additional', {
             'fields': ('notes',),
@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class ScdAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scd_app'
-    verbose_name = 'SCD - Slowly Changing Dimensions' 
\ No newline at end of file
+    verbose_name = 'SCD - Slowly Changing Dimensions'
+    
+    def ready(self):
+        from .models import Job, Timelog, PaymentLineItem
+        from .scd_manager import invalidate_cache_on_write
+        
+        for model_class in (Job, Timelog, PaymentLineItem):
+            post_save.connect(invalidate_cache_on_write, sender=model_class)
+            post_delete.connect(invalidate_cache_on_write, sender=model_class)
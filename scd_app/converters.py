@@ -0,0 +1,28 @@
+"""
+URL path converters for SCD app business IDs
+"""
+
+
+class BusinessIDConverter:
+    """
+    Base converter for prefixed business IDs.
+    
+    A malformed ID fails URL resolution with a 404 before the view runs
+    or the database is queried.
+    """
+    
+    def to_python(self, value):
+        return value
+    
+    def to_url(self, value):
+        return value
+
+
+class CompanyIDConverter(BusinessIDConverter):
+    # Company IDs are stored in a 255-character column
+    regex = r'comp_[A-Za-z0-9_]{1,250}'
+
+
+class ContractorIDConverter(BusinessIDConverter):
+    # Contractor IDs are stored in a 255-character column
+    regex = r'cont_[A-Za-z0-9_]{1,250}'
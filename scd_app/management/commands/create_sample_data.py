@@ -3,6 +3,8 @@ Management command to create sample SCD data for testing and demonstration
 """
 
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import datetime, timedelta
 import random
@@ -39,6 +41,12 @@ class Command(BaseCommand):
             default=3,
             help='Average number of versions per SCD record'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows per bulk INSERT'
+        )
         parser.add_argument(
             '--clear',
             action='store_true',
@@ -47,25 +55,36 @@ class Command(BaseCommand):
     
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Creating sample SCD data...'))
+        self.batch_size = options['batch_size']
+        # One creation timestamp for the whole run instead of a
+        # timezone.now() default call per instance
+        self.created_at = timezone.now()
         
         # Clear existing data if requested
         if options['clear']:
             self.clear_existing_data()
         
-        companies = self.create_companies(options['companies'])
-        contractors = self.create_contractors(options['contractors'])
-        jobs = self.create_jobs(companies, contractors, options['jobs'], options['versions'])
-        timelogs = self.create_timelogs(jobs, options['versions'])
-        payments = self.create_payment_line_items(jobs, timelogs, options['versions'])
+        # Generate everything in one transaction so the run commits once
+        with transaction.atomic():
+            companies = self.create_companies(options['companies'])
+            contractors = self.create_contractors(options['contractors'])
+            jobs, job_rows = self.create_jobs(companies, contractors, options['jobs'], options['versions'])
+            timelogs, timelog_rows = self.create_timelogs(jobs, options['versions'])
+            payments, payment_rows = self.create_payment_line_items(jobs, timelogs, options['versions'])
+        
+        # bulk_create() bypasses SCDAbstraction, so invalidate its cached
+        # results once the run has committed
+        for model_class in (Job, Timelog, PaymentLineItem):
+            SCDAbstraction.for_model(model_class).invalidate_cache()
         
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully created:\n'
                 f'  - {len(companies)} companies\n'
                 f'  - {len(contractors)} contractors\n'
-                f'  - {Job.objects.count()} job records ({len(jobs)} unique jobs)\n'
-                f'  - {Timelog.objects.count()} timelog records ({len(timelogs)} unique timelogs)\n'
-                f'  - {PaymentLineItem.objects.count()} payment records ({len(payments)} unique payments)'
+                f'  - {job_rows} job records ({len(jobs)} unique jobs)\n'
+                f'  - {timelog_rows} timelog records ({len(timelogs)} unique timelogs)\n'
+                f'  - {payment_rows} payment records ({len(payments)} unique payments)'
             )
         )
     
@@ -73,56 +92,61 @@ class Command(BaseCommand):
         """Clear all existing sample data"""
         self.stdout.write('Clearing existing data...')
         
-        # Delete in order to respect foreign key constraints
-        PaymentLineItem.objects.all().delete()
-        Timelog.objects.all().delete()
-        Job.objects.all().delete()
-        Contractor.objects.all().delete()
-        Company.objects.all().delete()
+        # Flush the tables with raw SQL (a single TRUNCATE ... CASCADE on
+        # PostgreSQL) rather than QuerySet.delete(), which loads every row's
+        # PK into memory to collect cascades. Backends that issue one DELETE
+        # per table run them in a single transaction.
+        tables = [
+            model._meta.db_table
+            for model in (PaymentLineItem, Timelog, Job, Contractor, Company)
+        ]
+        sql_list = connection.ops.sql_flush(no_style(), tables, allow_cascade=True)
+        connection.ops.execute_sql_flush(sql_list)
         
         self.stdout.write(self.style.SUCCESS('Existing data cleared'))
     
     def create_companies(self, count):
         """Create sample companies"""
-        companies = []
-        created_count = 0
-        for i in range(count):
-            company, created = Company.objects.get_or_create(
-                id=f"comp_{i+1:03d}",
-                defaults={
-                    'name': f"Company {i+1}",
-                    'email': f"company{i+1}@example.com"
-                }
+        companies = [
+            Company(
+                id=f"comp_{i+1:03d}", name=f"Company {i+1}", email=f"company{i+1}@example.com",
+                created_at=self.created_at
             )
-            companies.append(company)
-            if created:
-                created_count += 1
+            for i in range(count)
+        ]
+        existing = set(
+            Company.objects.filter(id__in=[c.id for c in companies]).values_list('id', flat=True)
+        )
+        to_create = [c for c in companies if c.id not in existing]
+        Company.objects.bulk_create(to_create, batch_size=self.batch_size, ignore_conflicts=True)
         
-        self.stdout.write(f'Created {created_count} companies ({count - created_count} already existed)')
+        self.stdout.write(f'Created {len(to_create)} companies ({len(existing)} already existed)')
         return companies
     
     def create_contractors(self, count):
         """Create sample contractors"""
-        contractors = []
-        created_count = 0
-        for i in range(count):
-            contractor, created = Contractor.objects.get_or_create(
-                id=f"cont_{i+1:03d}",
-                defaults={
-                    'name': f"Contractor {i+1}",
-                    'email': f"contractor{i+1}@example.com"
-                }
+        contractors = [
+            Contractor(
+                id=f"cont_{i+1:03d}", name=f"Contractor {i+1}", email=f"contractor{i+1}@example.com",
+                created_at=self.created_at
             )
-            contractors.append(contractor)
-            if created:
-                created_count += 1
+            for i in range(count)
+        ]
+        existing = set(
+            Contractor.objects.filter(id__in=[c.id for c in contractors]).values_list('id', flat=True)
+        )
+        to_create = [c for c in contractors if c.id not in existing]
+        Contractor.objects.bulk_create(to_create, batch_size=self.batch_size, ignore_conflicts=True)
         
-        self.stdout.write(f'Created {created_count} contractors ({count - created_count} already existed)')
+        self.stdout.write(f'Created {len(to_create)} contractors ({len(existing)} already existed)')
         return contractors
     
     def create_jobs(self, companies, contractors, count, avg_versions):
-        """Create sample jobs with multiple versions"""
-        job_scd = SCDAbstraction(Job)
+        """
+        Create sample jobs with multiple versions.
+        
+        Returns (business_ids, number_of_version_rows_inserted).
+        """
         jobs = []
         
         job_titles = [
@@ -134,32 +158,40 @@ class Command(BaseCommand):
         
         statuses = ['active', 'extended', 'paused', 'completed']
         
+        existing_ids = set(Job.objects.values_list('id', flat=True).distinct())
+        
+        # Draw the per-job random picks in bulk rather than inside the loop
+        company_picks = random.choices(companies, k=count)
+        contractor_picks = random.choices(contractors, k=count)
+        title_picks = random.choices(job_titles, k=count)
+        version_counts = random.choices(range(1, avg_versions + 1), k=count)
+        
+        initial_records = []
+        pending_versions = []
         for i in range(count):
-            company = random.choice(companies)
-            contractor = random.choice(contractors)
+            company = company_picks[i]
+            contractor = contractor_picks[i]
             
             business_id = f"job_{i+1:03d}"
             
             # Check if job already exists
-            existing_job = job_scd.get_latest_records({'id': business_id}).first()
-            if existing_job:
+            if business_id in existing_ids:
                 self.stdout.write(f'Job {business_id} already exists, skipping...')
                 jobs.append(business_id)
                 continue
             
-            # Create initial version
-            job = job_scd.create_record(
-                business_id=business_id,
-                title=random.choice(job_titles),
-                status='active',
-                rate=round(random.uniform(20.0, 50.0), 2),
-                description=f"Description for job {i+1}",
-                company_id=company.id,
-                contractor_id=contractor.id
-            )
+            initial_fields = {
+                'title': title_picks[i],
+                'status': 'active',
+                'rate': round(random.uniform(20.0, 50.0), 2),
+                'description': f"Description for job {i+1}",
+                'company_id': company.id,
+                'contractor_id': contractor.id,
+            }
             
-            # Create additional versions
-            versions_to_create = random.randint(1, avg_versions)
+            # Plan additional versions
+            updates_list = []
+            versions_to_create = version_counts[i]
             for v in range(versions_to_create - 1):
                 updates = {}
                 
@@ -174,124 +206,203 @@ class Command(BaseCommand):
                     updates['title'] = random.choice(job_titles)
                 
                 if updates:
-                    job = job_scd.update_record(business_id, **updates)
+                    updates_list.append(updates)
             
+            initial_record, later_versions = self.build_versions(Job, business_id, initial_fields, updates_list)
+            initial_records.append(initial_record)
+            pending_versions.extend(later_versions)
             jobs.append(business_id)
         
+        rows = self.insert_versions(Job, initial_records, pending_versions)
+        
         self.stdout.write(f'Created {count} jobs with versions')
-        return jobs
+        return jobs, rows
     
     def create_timelogs(self, jobs, avg_versions):
-        """Create sample timelogs"""
-        timelog_scd = SCDAbstraction(Timelog)
+        """
+        Create sample timelogs.
+        
+        Returns (business_ids, number_of_version_rows_inserted).
+        """
         timelogs = []
+        initial_records = []
+        pending_versions = []
         
         # Get latest job versions to get UIDs
-        job_scd = SCDAbstraction(Job)
-        latest_jobs = job_scd.get_latest_records()
-        job_uids = [job.uid for job in latest_jobs]
+        job_scd = SCDAbstraction.for_model(Job)
+        job_uids = list(job_scd.get_latest_records().values_list('uid', flat=True))
         
         types = ['captured', 'adjusted', 'manual']
         
+        existing_ids = set(Timelog.objects.values_list('id', flat=True).distinct())
+        
+        # Bind hot-loop callables and the reference time once
+        _choice = random.choice
+        _uniform = random.uniform
+        _randint = random.randint
+        _random = random.random
+        now = datetime.now()
+        
         # Create 2-5 timelogs per job
+        timelog_counts = random.choices(range(2, 6), k=len(jobs))
         for i, job_business_id in enumerate(jobs):
-            num_timelogs = random.randint(2, 5)
+            num_timelogs = timelog_counts[i]
             
             for t in range(num_timelogs):
                 business_id = f"timelog_{i+1:03d}_{t+1:02d}"
                 
                 # Check if timelog already exists
-                existing_timelog = timelog_scd.get_latest_records({'id': business_id}).first()
-                if existing_timelog:
+                if business_id in existing_ids:
                     timelogs.append(business_id)
                     continue
                 
                 # Random time range in the last 30 days
-                days_ago = random.randint(0, 30)
-                start_time = datetime.now() - timedelta(days=days_ago, hours=random.randint(8, 16))
-                duration_hours = random.uniform(0.5, 8.0)
+                days_ago = _randint(0, 30)
+                start_time = now - timedelta(days=days_ago, hours=_randint(8, 16))
+                duration_hours = _uniform(0.5, 8.0)
                 duration_ms = int(duration_hours * 60 * 60 * 1000)
                 end_time = start_time + timedelta(milliseconds=duration_ms)
                 
-                job_uid = random.choice(job_uids)
+                job_uid = _choice(job_uids)
                 
-                # Create initial version
-                timelog = timelog_scd.create_record(
-                    business_id=business_id,
-                    duration=duration_ms,
-                    time_start=int(start_time.timestamp() * 1000),
-                    time_end=int(end_time.timestamp() * 1000),
-                    type='captured',
-                    job_uid=job_uid
-                )
+                initial_fields = {
+                    'duration': duration_ms,
+                    'time_start': int(start_time.timestamp() * 1000),
+                    'time_end': int(end_time.timestamp() * 1000),
+                    'type': 'captured',
+                    'job_id': job_uid,
+                }
                 
                 # Maybe create adjusted version
-                if random.random() < 0.3:  # 30% chance of adjustment
-                    adjusted_duration = int(duration_ms * random.uniform(0.7, 1.3))
-                    timelog = timelog_scd.update_record(
-                        business_id,
-                        duration=adjusted_duration,
-                        type='adjusted'
-                    )
+                updates_list = []
+                if _random() < 0.3:  # 30% chance of adjustment
+                    adjusted_duration = int(duration_ms * _uniform(0.7, 1.3))
+                    updates_list.append({'duration': adjusted_duration, 'type': 'adjusted'})
                 
+                initial_record, later_versions = self.build_versions(
+                    Timelog, business_id, initial_fields, updates_list
+                )
+                initial_records.append(initial_record)
+                pending_versions.extend(later_versions)
                 timelogs.append(business_id)
         
+        rows = self.insert_versions(Timelog, initial_records, pending_versions)
+        
         self.stdout.write(f'Created timelogs for jobs')
-        return timelogs
+        return timelogs, rows
     
     def create_payment_line_items(self, jobs, timelogs, avg_versions):
-        """Create sample payment line items"""
-        payment_scd = SCDAbstraction(PaymentLineItem)
+        """
+        Create sample payment line items.
+        
+        Returns (business_ids, number_of_version_rows_inserted).
+        """
         payments = []
+        initial_records = []
+        pending_versions = []
         
         # Get latest versions
-        job_scd = SCDAbstraction(Job)
-        timelog_scd = SCDAbstraction(Timelog)
-        
-        latest_jobs = job_scd.get_latest_records()
-        latest_timelogs = timelog_scd.get_latest_records()
+        job_scd = SCDAbstraction.for_model(Job)
+        timelog_scd = SCDAbstraction.for_model(Timelog)
         
-        job_uids = [job.uid for job in latest_jobs]
-        timelog_uids = [timelog.uid for timelog in latest_timelogs]
+        job_uids = list(job_scd.get_latest_records().values_list('uid', flat=True))
+        timelog_uids = list(timelog_scd.get_latest_records().values_list('uid', flat=True))
         
         statuses = ['not-paid', 'paid', 'pending', 'failed']
         
+        existing_ids = set(PaymentLineItem.objects.values_list('id', flat=True).distinct())
+        
+        # Bind hot-loop callables and the reference time once
+        _choice = random.choice
+        _uniform = random.uniform
+        _randint = random.randint
+        _random = random.random
+        now = timezone.now()
+        
         # Create 1-2 payments per timelog
+        job_uid_picks = random.choices(job_uids, k=len(timelogs))
+        timelog_uid_picks = random.choices(timelog_uids, k=len(timelogs))
         for i, timelog_business_id in enumerate(timelogs):
             business_id = f"payment_{i+1:04d}"
             
             # Check if payment already exists
-            existing_payment = payment_scd.get_latest_records({'id': business_id}).first()
-            if existing_payment:
+            if business_id in existing_ids:
                 payments.append(business_id)
                 continue
             
-            amount = round(random.uniform(50.0, 500.0), 2)
+            amount = round(_uniform(50.0, 500.0), 2)
             
-            # Create initial version
-            payment = payment_scd.create_record(
-                business_id=business_id,
-                amount=amount,
-                status='not-paid',
-                job_uid=random.choice(job_uids),
-                timelog_uid=random.choice(timelog_uids),
-                notes=f"Payment for timelog {timelog_business_id}"
-            )
+            initial_fields = {
+                'amount': amount,
+                'status': 'not-paid',
+                'job_id': job_uid_picks[i],
+                'timelog_id': timelog_uid_picks[i],
+                'notes': f"Payment for timelog {timelog_business_id}",
+            }
             
             # Maybe update status
-            if random.random() < 0.7:  # 70% chance of status change
-                new_status = random.choice(statuses)
+            updates_list = []
+            if _random() < 0.7:  # 70% chance of status change
+                new_status = _choice(statuses)
                 payment_date = None
                 if new_status == 'paid':
-                    payment_date = timezone.now() - timedelta(days=random.randint(0, 10))
+                    payment_date = now - timedelta(days=_randint(0, 10))
                 
-                payment = payment_scd.update_record(
-                    business_id,
-                    status=new_status,
-                    payment_date=payment_date
-                )
+                updates_list.append({'status': new_status, 'payment_date': payment_date})
             
+            initial_record, later_versions = self.build_versions(
+                PaymentLineItem, business_id, initial_fields, updates_list
+            )
+            initial_records.append(initial_record)
+            pending_versions.extend(later_versions)
             payments.append(business_id)
         
+        rows = self.insert_versions(PaymentLineItem, initial_records, pending_versions)
+        
         self.stdout.write(f'Created payment line items')
-        return payments 
\ No newline at end of file
+        return payments, rows
+    
+    def build_versions(self, model_class, business_id, initial_fields, updates_list):
+        """
+        Build a record's full version chain for insert_versions().
+        
+        Returns the version 1 field dict, in the form
+        SCDAbstraction.bulk_create_initial() takes, and unsaved instances
+        for the later versions. Each later version carries forward the
+        previous version's fields (as SCDAbstraction.update_record() does)
+        and gets its own UID, so they can be written with bulk_create().
+        """
+        latest_version = len(updates_list) + 1
+        initial_record = {
+            'business_id': business_id,
+            'is_current': latest_version == 1,
+            **initial_fields,
+        }
+        
+        versions = []
+        fields = dict(initial_fields)
+        uids = model_class.generate_uids(len(updates_list))
+        for version, updates in enumerate(updates_list, start=2):
+            fields.update(updates)
+            versions.append(model_class(
+                id=business_id,
+                version=version,
+                uid=uids[version - 2],
+                is_current=(version == latest_version),
+                created_at=self.created_at,
+                **fields
+            ))
+        return initial_record, versions
+    
+    def insert_versions(self, model_class, initial_records, later_versions):
+        """
+        Insert built version chains; returns the number of rows written.
+        
+        Version 1 rows go through SCDAbstraction.bulk_create_initial(), which
+        assigns their UIDs, and later versions follow with bulk_create().
+        """
+        SCDAbstraction.for_model(model_class).bulk_create_initial(
+            initial_records, batch_size=self.batch_size, created_at=self.created_at
+        )
+        model_class.objects.bulk_create(later_versions, batch_size=self.batch_size)
+        return len(initial_records) + len(later_versions)
\ No newline at end of file
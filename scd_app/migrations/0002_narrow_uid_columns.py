@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='uid',
+            field=models.CharField(help_text='Unique ID for this version', max_length=64, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='paymentlineitem',
+            name='job_uid',
+            field=models.CharField(db_index=True, help_text='References specific Job version', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='paymentlineitem',
+            name='timelog_uid',
+            field=models.CharField(db_index=True, help_text='References specific Timelog version', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='paymentlineitem',
+            name='uid',
+            field=models.CharField(help_text='Unique ID for this version', max_length=64, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='timelog',
+            name='job_uid',
+            field=models.CharField(db_index=True, help_text='References specific Job version', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='timelog',
+            name='uid',
+            field=models.CharField(help_text='Unique ID for this version', max_length=64, primary_key=True, serialize=False),
+        ),
+    ]
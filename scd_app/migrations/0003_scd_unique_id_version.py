@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0002_narrow_uid_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='id',
+            field=models.CharField(help_text='Business ID (same across versions)', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='paymentlineitem',
+            name='id',
+            field=models.CharField(help_text='Business ID (same across versions)', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='timelog',
+            name='id',
+            field=models.CharField(help_text='Business ID (same across versions)', max_length=255),
+        ),
+        migrations.AlterUniqueTogether(
+            name='job',
+            unique_together={('id', 'version')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='paymentlineitem',
+            unique_together={('id', 'version')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='timelog',
+            unique_together={('id', 'version')},
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['created_at'], name='scd_jobs_created_930e39_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentlineitem',
+            index=models.Index(fields=['created_at'], name='scd_payment_created_cc36f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timelog',
+            index=models.Index(fields=['created_at'], name='scd_timelog_created_812025_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0003_scd_unique_id_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['id', '-version'], name='job_id_ver_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentlineitem',
+            index=models.Index(fields=['id', '-version'], name='paymentlineitem_id_ver_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='timelog',
+            index=models.Index(fields=['id', '-version'], name='timelog_id_ver_desc'),
+        ),
+    ]
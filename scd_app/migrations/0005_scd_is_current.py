@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:42
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def mark_superseded_versions(apps, schema_editor):
+    """Clear is_current on every row that has a newer version"""
+    for model_name in ('Job', 'Timelog', 'PaymentLineItem'):
+        model = apps.get_model('scd_app', model_name)
+        newer = model.objects.filter(id=OuterRef('id'), version__gt=OuterRef('version'))
+        model.objects.filter(Exists(newer)).update(is_current=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0004_scd_id_version_desc_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='is_current',
+            field=models.BooleanField(default=True, help_text='Whether this is the latest version'),
+        ),
+        migrations.AddField(
+            model_name='paymentlineitem',
+            name='is_current',
+            field=models.BooleanField(default=True, help_text='Whether this is the latest version'),
+        ),
+        migrations.AddField(
+            model_name='timelog',
+            name='is_current',
+            field=models.BooleanField(default=True, help_text='Whether this is the latest version'),
+        ),
+        migrations.RunPython(mark_superseded_versions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['id'], name='job_current_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentlineitem',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['id'], name='paymentlineitem_current_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timelog',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['id'], name='timelog_current_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0005_scd_is_current'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timelog',
+            name='scd_timelog_job_uid_79071a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='paymentlineitem',
+            name='scd_payment_job_uid_cbed58_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='paymentlineitem',
+            name='scd_payment_timelog_ca1e33_idx',
+        ),
+        # Convert in place (db_column keeps the existing column), then rename
+        # the model field; the rename does not touch the database.
+        migrations.AlterField(
+            model_name='timelog',
+            name='job_uid',
+            field=models.ForeignKey(db_column='job_uid', help_text='References specific Job version', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='scd_app.job'),
+        ),
+        migrations.RenameField(
+            model_name='timelog',
+            old_name='job_uid',
+            new_name='job',
+        ),
+        migrations.AlterField(
+            model_name='paymentlineitem',
+            name='job_uid',
+            field=models.ForeignKey(db_column='job_uid', help_text='References specific Job version', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='scd_app.job'),
+        ),
+        migrations.RenameField(
+            model_name='paymentlineitem',
+            old_name='job_uid',
+            new_name='job',
+        ),
+        migrations.AlterField(
+            model_name='paymentlineitem',
+            name='timelog_uid',
+            field=models.ForeignKey(db_column='timelog_uid', help_text='References specific Timelog version', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='scd_app.timelog'),
+        ),
+        migrations.RenameField(
+            model_name='paymentlineitem',
+            old_name='timelog_uid',
+            new_name='timelog',
+        ),
+    ]
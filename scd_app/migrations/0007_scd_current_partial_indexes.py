@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0006_scd_foreign_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['company_id'], name='job_current_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['contractor_id'], name='job_current_contractor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentlineitem',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['job'], name='payment_current_job_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timelog',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['job'], name='timelog_current_job_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:48
+
+from django.db import migrations
+
+
+SCD_TABLES = ('scd_jobs', 'scd_timelogs', 'scd_payment_line_items')
+
+# SQLite drops a table's triggers when a migration rebuilds it (AlterField and
+# friends), so later migrations touching these tables must recreate them.
+SQLITE_CREATE_TRIGGER = """
+CREATE TRIGGER {table}_is_current AFTER INSERT ON {table}
+BEGIN
+    UPDATE {table} SET is_current = 0
+    WHERE id = NEW.id AND version < NEW.version AND is_current;
+    UPDATE {table} SET is_current = 0
+    WHERE uid = NEW.uid AND EXISTS (
+        SELECT 1 FROM {table} WHERE id = NEW.id AND version > NEW.version
+    );
+END
+"""
+
+POSTGRESQL_CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION scd_maintain_is_current() RETURNS trigger AS $$
+BEGIN
+    EXECUTE format(
+        'UPDATE %I SET is_current = FALSE WHERE id = $1 AND version < $2 AND is_current',
+        TG_TABLE_NAME
+    ) USING NEW.id, NEW.version;
+    EXECUTE format(
+        'UPDATE %I SET is_current = FALSE WHERE uid = $1 AND EXISTS '
+        '(SELECT 1 FROM %I WHERE id = $2 AND version > $3)',
+        TG_TABLE_NAME, TG_TABLE_NAME
+    ) USING NEW.uid, NEW.id, NEW.version;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+POSTGRESQL_CREATE_TRIGGER = """
+CREATE TRIGGER {table}_is_current AFTER INSERT ON {table}
+FOR EACH ROW EXECUTE FUNCTION scd_maintain_is_current()
+"""
+
+
+def create_triggers(apps, schema_editor):
+    """Keep is_current in step with inserts that bypass update_record()"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table in SCD_TABLES:
+            schema_editor.execute(SQLITE_CREATE_TRIGGER.format(table=table))
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRESQL_CREATE_FUNCTION)
+        for table in SCD_TABLES:
+            schema_editor.execute(POSTGRESQL_CREATE_TRIGGER.format(table=table))
+
+
+def drop_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table in SCD_TABLES:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_is_current")
+    elif vendor == 'postgresql':
+        for table in SCD_TABLES:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_is_current ON {table}")
+        schema_editor.execute("DROP FUNCTION IF EXISTS scd_maintain_is_current()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0007_scd_current_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0008_scd_is_current_triggers'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_current_company_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_current_contractor_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['company_id', 'status'], name='job_current_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['contractor_id', 'status'], name='job_current_contractor_idx'),
+        ),
+    ]
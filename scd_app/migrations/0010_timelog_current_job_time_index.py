@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd_app', '0009_job_current_status_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timelog',
+            name='timelog_current_job_idx',
+        ),
+        migrations.AddIndex(
+            model_name='timelog',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['job', 'time_start'], name='timelog_current_job_idx'),
+        ),
+    ]
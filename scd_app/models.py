@@ -5,7 +5,9 @@ This module contains the core SCD models for Jobs, Timelogs, and PaymentLineItem
 Each model follows the SCD pattern with (id, version) as unique key and uid as primary key.
 """
 
-import uuid
+import os
+import secrets
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.db import models
 from django.utils import timezone
 
@@ -18,14 +20,16 @@ class SCDModelMixin(models.Model):
     - id: Business identifier (stays same across versions)
     - version: Version number (increments with each change)
     - uid: Unique identifier for this specific version (primary key)
+    - is_current: True only on the latest version of each business ID
     - created_at: When this version was created
     - updated_at: When this version was last updated
     """
     
     # SCD Core Fields
-    id = models.CharField(max_length=255, db_index=True, help_text="Business ID (same across versions)")
+    id = models.CharField(max_length=255, help_text="Business ID (same across versions)")
     version = models.PositiveIntegerField(help_text="Version number")
-    uid = models.CharField(max_length=255, primary_key=True, help_text="Unique ID for this version")
+    uid = models.CharField(max_length=64, primary_key=True, help_text="Unique ID for this version")
+    is_current = models.BooleanField(default=True, help_text="Whether this is the latest version")
     
     # Audit Fields
     created_at = models.DateTimeField(default=timezone.now)
@@ -33,19 +37,33 @@ class SCDModelMixin(models.Model):
     
     class Meta:
         abstract = True
+        # The unique (id, version) index also serves lookups on id alone
         unique_together = ['id', 'version']
         indexes = [
-            models.Index(fields=['id', 'version']),
-            models.Index(fields=['id']),
+            # Serves "latest version of id" lookups (ORDER BY version DESC LIMIT 1)
+            models.Index(fields=['id', '-version'], name='%(class)s_id_ver_desc'),
+            # Partial index over the latest versions only
+            models.Index(fields=['id'], condition=models.Q(is_current=True), name='%(class)s_current_idx'),
             models.Index(fields=['created_at']),
         ]
     
+    @classmethod
+    def generate_uid(cls):
+        """Generate a version UID with a model-specific prefix"""
+        model_prefix = cls.__name__.lower()
+        return f"{model_prefix}_uid_{secrets.token_hex(10)}"
+    
+    @classmethod
+    def generate_uids(cls, count):
+        """Generate count UIDs from a single read of the OS entropy source"""
+        model_prefix = cls.__name__.lower()
+        entropy = os.urandom(10 * count).hex()
+        return [f"{model_prefix}_uid_{entropy[i:i + 20]}" for i in range(0, 20 * count, 20)]
+    
     def save(self, *args, **kwargs):
         """Generate UID if not provided"""
         if not self.uid:
-            # Generate UID with model-specific prefix
-            model_prefix = self.__class__.__name__.lower()
-            self.uid = f"{model_prefix}_uid_{uuid.uuid4().hex[:20]}"
+            self.uid = self.generate_uid()
         
         super().save(*args, **kwargs)
     
@@ -78,12 +96,22 @@ class Job(SCDModelMixin):
     company_id = models.CharField(max_length=255, db_index=True)
     contractor_id = models.CharField(max_length=255, db_index=True)
     
-    class Meta:
+    class Meta(SCDModelMixin.Meta):
         db_table = 'scd_jobs'
-        indexes = [
+        indexes = SCDModelMixin.Meta.indexes + [
             models.Index(fields=['company_id']),
             models.Index(fields=['contractor_id']),
             models.Index(fields=['status']),
+            # Latest-version lookups by company/contractor (and usually status)
+            # skip superseded rows
+            models.Index(
+                fields=['company_id', 'status'], condition=models.Q(is_current=True),
+                name='job_current_company_idx'
+            ),
+            models.Index(
+                fields=['contractor_id', 'status'], condition=models.Q(is_current=True),
+                name='job_current_contractor_idx'
+            ),
         ]
     
     def __str__(self):
@@ -111,19 +139,47 @@ class Timelog(SCDModelMixin):
     description = models.TextField(blank=True)
     
     # Foreign Key to specific Job version
-    job_uid = models.CharField(max_length=255, db_index=True, help_text="References specific Job version")
+    job = models.ForeignKey(
+        'Job', to_field='uid', on_delete=models.PROTECT, db_column='job_uid',
+        related_name='+', help_text="References specific Job version"
+    )
     
-    class Meta:
+    class Meta(SCDModelMixin.Meta):
         db_table = 'scd_timelogs'
-        indexes = [
-            models.Index(fields=['job_uid']),
+        indexes = SCDModelMixin.Meta.indexes + [
             models.Index(fields=['type']),
             models.Index(fields=['time_start']),
             models.Index(fields=['time_end']),
+            # Latest timelogs of a set of jobs within a time window
+            models.Index(
+                fields=['job', 'time_start'], condition=models.Q(is_current=True),
+                name='timelog_current_job_idx'
+            ),
         ]
     
     def __str__(self):
         return f"Timelog({self.id}): {self.duration}ms - {self.type} (v{self.version})"
+    
+    @property
+    def duration_timedelta(self):
+        """Duration as a timedelta"""
+        if self.duration is None:
+            return None
+        return timedelta(milliseconds=self.duration)
+    
+    @property
+    def start_datetime(self):
+        """time_start as an aware UTC datetime"""
+        if self.time_start is None:
+            return None
+        return datetime.fromtimestamp(self.time_start / 1000, tz=dt_timezone.utc)
+    
+    @property
+    def end_datetime(self):
+        """time_end as an aware UTC datetime"""
+        if self.time_end is None:
+            return None
+        return datetime.fromtimestamp(self.time_end / 1000, tz=dt_timezone.utc)
 
 
 class PaymentLineItem(SCDModelMixin):
@@ -148,16 +204,21 @@ class PaymentLineItem(SCDModelMixin):
     notes = models.TextField(blank=True)
     
     # Foreign Keys to specific versions
-    job_uid = models.CharField(max_length=255, db_index=True, help_text="References specific Job version")
-    timelog_uid = models.CharField(max_length=255, db_index=True, help_text="References specific Timelog version")
-    
-    class Meta:
+    job = models.ForeignKey(
+        'Job', to_field='uid', on_delete=models.PROTECT, db_column='job_uid',
+        related_name='+', help_text="References specific Job version"
+    )
+    timelog = models.ForeignKey(
+        'Timelog', to_field='uid', on_delete=models.PROTECT, db_column='timelog_uid',
+        related_name='+', help_text="References specific Timelog version"
+    )
+    
+    class Meta(SCDModelMixin.Meta):
         db_table = 'scd_payment_line_items'
-        indexes = [
-            models.Index(fields=['job_uid']),
-            models.Index(fields=['timelog_uid']),
+        indexes = SCDModelMixin.Meta.indexes + [
             models.Index(fields=['status']),
             models.Index(fields=['payment_date']),
+            models.Index(fields=['job'], condition=models.Q(is_current=True), name='payment_current_job_idx'),
         ]
     
     def __str__(self):
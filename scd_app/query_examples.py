@@ -9,11 +9,43 @@ This module shows how the SCD abstraction simplifies the 4 required query patter
 """
 
 from datetime import datetime, timedelta
-from django.db.models import Q, Max, F, Subquery, OuterRef
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q, Max, F, Subquery, OuterRef, Sum, Count
+from django.utils import timezone
 from .models import Job, Timelog, PaymentLineItem, Company, Contractor
 from .scd_manager import SCDAbstraction, get_latest_jobs, get_latest_timelogs, get_latest_payment_line_items
 
 
+# Payment amounts are stored with two decimal places
+CENTS = Decimal('0.01')
+
+
+def _cents(amount):
+    """
+    A money SUM() at the stored two decimal places.
+    
+    SQLite returns SUM() over decimals unscaled ('150' or, via its float
+    arithmetic, '0.300000000000000'), so totals are quantized to cents.
+    """
+    return (amount or Decimal(0)).quantize(CENTS)
+
+
+def _latest_versions_within(queryset):
+    """
+    Latest version of each business ID among the rows of queryset.
+    
+    Unlike get_latest_records() this groups only the rows already selected,
+    as the manual "old way" examples do. PostgreSQL uses DISTINCT ON (id);
+    other backends compare against a correlated newest-version subquery.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        return queryset.order_by('id', '-version').distinct('id')
+    newest_version = queryset.filter(id=OuterRef('id')).order_by('-version').values('version')[:1]
+    return queryset.filter(version=Subquery(newest_version))
+
+
 class SCDQueryExamples:
     """
     Examples showing before/after the SCD abstraction.
@@ -23,9 +55,9 @@ class SCDQueryExamples:
     """
     
     def __init__(self):
-        self.job_scd = SCDAbstraction(Job)
-        self.timelog_scd = SCDAbstraction(Timelog)
-        self.payment_scd = SCDAbstraction(PaymentLineItem)
+        self.job_scd = SCDAbstraction.for_model(Job)
+        self.timelog_scd = SCDAbstraction.for_model(Timelog)
+        self.payment_scd = SCDAbstraction.for_model(PaymentLineItem)
     
     # ============================================================================
     # QUERY PATTERN 1: Get all active Jobs for a company
@@ -36,8 +68,6 @@ class SCDQueryExamples:
         OLD WAY: Complex SCD query with manual latest version handling
         """
         # This is what developers had to write before the abstraction
-        from django.db.models import Max
-        
         jobs = Job.objects.annotate(
             max_version=Subquery(
                 Job.objects.filter(
@@ -124,7 +154,7 @@ class SCDQueryExamples:
         latest_payments = PaymentLineItem.objects.values('id').annotate(
             max_version=Max('version')
         ).filter(
-            job_uid__in=job_uids,
+            job_id__in=job_uids,
             created_at__range=[start_date, end_date]
         )
         
@@ -145,15 +175,12 @@ class SCDQueryExamples:
         """
         NEW WAY: Much simpler with abstraction
         """
-        # Get latest jobs for contractor
-        job_uids = list(
-            self.job_scd.get_latest_records({'contractor_id': contractor_id})
-            .values_list('uid', flat=True)
-        )
+        # Get latest jobs for contractor (kept as a subquery)
+        job_uids = self.job_scd.get_latest_records({'contractor_id': contractor_id}).values('uid')
         
         # Get latest payment line items for those jobs in the time period
         return self.payment_scd.get_latest_records({
-            'job_uid__in': job_uids
+            'job_id__in': job_uids
         }).filter(created_at__range=[start_date, end_date])
     
     def get_payment_line_items_for_contractor_optimized(self, contractor_id: str, 
@@ -162,12 +189,12 @@ class SCDQueryExamples:
         """
         OPTIMIZED WAY: Using convenience function with date filtering
         """
-        # Get job UIDs
-        job_uids = get_latest_jobs(contractor_id=contractor_id).values_list('uid', flat=True)
+        # Job UIDs stay a subquery so the whole lookup is one SQL statement
+        job_uids = get_latest_jobs(contractor_id=contractor_id).values('uid')
         
         # Get payment line items
         return get_latest_payment_line_items(
-            job_uid__in=list(job_uids)
+            job_id__in=job_uids
         ).filter(created_at__range=[start_date, end_date])
     
     # ============================================================================
@@ -183,38 +210,18 @@ class SCDQueryExamples:
         # Get all job versions for contractor
         contractor_jobs = Job.objects.filter(contractor_id=contractor_id)
         
-        # Group by business ID and find latest versions
-        latest_job_uids = []
-        job_groups = {}
-        for job in contractor_jobs:
-            if job.id not in job_groups:
-                job_groups[job.id] = []
-            job_groups[job.id].append(job)
-        
-        for business_id, versions in job_groups.items():
-            latest_version = max(versions, key=lambda x: x.version)
-            latest_job_uids.append(latest_version.uid)
+        # Find latest versions (grouped by business ID in the database)
+        latest_job_uids = _latest_versions_within(contractor_jobs).values('uid')
         
         # Get timelogs for those jobs
         timelogs = Timelog.objects.filter(
-            job_uid__in=latest_job_uids,
+            job_id__in=latest_job_uids,
             time_start__gte=start_timestamp,
             time_end__lte=end_timestamp
         )
         
         # Filter to latest versions of timelogs
-        latest_timelogs = []
-        timelog_groups = {}
-        for timelog in timelogs:
-            if timelog.id not in timelog_groups:
-                timelog_groups[timelog.id] = []
-            timelog_groups[timelog.id].append(timelog)
-        
-        for business_id, versions in timelog_groups.items():
-            latest_version = max(versions, key=lambda x: x.version)
-            latest_timelogs.append(latest_version)
-        
-        return latest_timelogs
+        return list(_latest_versions_within(timelogs))
     
     def get_timelogs_for_contractor_new_way(self, contractor_id: str, 
                                            start_timestamp: int, 
@@ -222,15 +229,12 @@ class SCDQueryExamples:
         """
         NEW WAY: Clean and efficient
         """
-        # Get latest job UIDs for contractor
-        job_uids = list(
-            self.job_scd.get_latest_records({'contractor_id': contractor_id})
-            .values_list('uid', flat=True)
-        )
+        # Get latest job UIDs for contractor (kept as a subquery)
+        job_uids = self.job_scd.get_latest_records({'contractor_id': contractor_id}).values('uid')
         
         # Get latest timelogs for those jobs in the time period
         return self.timelog_scd.get_latest_records({
-            'job_uid__in': job_uids,
+            'job_id__in': job_uids,
             'time_start__gte': start_timestamp,
             'time_end__lte': end_timestamp
         })
@@ -243,33 +247,47 @@ class SCDQueryExamples:
         """
         Example: Getting all related data for a contractor dashboard
         Demonstrates efficient queries for millions of records
+        
+        The returned jobs/timelogs/payment_items querysets are restricted
+        with only() to the fields the dashboard renders; other fields load
+        lazily, one query per row. They deliberately skip select_related():
+        the dashboard reads no related rows (timelogs and payments keep their
+        job reference as the stored UID), so a join would only add columns.
         """
-        end_date = datetime.now()
+        # Bounds are snapped to the hour (end rounded up so nothing recent is
+        # dropped) so repeated calls issue identical, cacheable queries
+        end_date = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
         start_date = end_date - timedelta(days=days_back)
         start_timestamp = int(start_date.timestamp() * 1000)
         end_timestamp = int(end_date.timestamp() * 1000)
         
-        # Get all latest jobs for contractor
+        # Get all latest jobs for contractor; their UIDs are used as a
+        # subquery so they never round-trip through Python
         jobs = self.job_scd.get_latest_records({'contractor_id': contractor_id})
-        job_uids = list(jobs.values_list('uid', flat=True))
+        job_uids = jobs.values('uid')
         
         # Get related data efficiently (avoiding N+1 queries)
         timelogs = self.timelog_scd.get_latest_records({
-            'job_uid__in': job_uids,
+            'job_id__in': job_uids,
             'time_start__gte': start_timestamp,
             'time_end__lte': end_timestamp
         })
         
         payment_items = self.payment_scd.get_latest_records({
-            'job_uid__in': job_uids
+            'job_id__in': job_uids
         }).filter(created_at__range=[start_date, end_date])
         
+        # Totals are summed by the database rather than over fetched rows
+        total_duration = timelogs.aggregate(total_duration=Sum('duration'))['total_duration'] or 0
+        total_amount = _cents(payment_items.aggregate(total_amount=Sum('amount'))['total_amount'])
+        
+        # The row querysets load only the columns the dashboard displays
         return {
-            'jobs': jobs,
-            'timelogs': timelogs,
-            'payment_items': payment_items,
-            'total_hours': sum(t.duration for t in timelogs) / (1000 * 60 * 60),  # Convert ms to hours
-            'total_amount': sum(p.amount for p in payment_items),
+            'jobs': jobs.only('id', 'version', 'uid', 'title', 'status', 'rate'),
+            'timelogs': timelogs.only('id', 'version', 'uid', 'duration', 'type'),
+            'payment_items': payment_items.only('id', 'version', 'uid', 'amount', 'status'),
+            'total_hours': total_duration / (1000 * 60 * 60),  # Convert ms to hours
+            'total_amount': total_amount,
         }
     
     def get_company_spending_report(self, company_id: str, month: int, year: int):
@@ -286,30 +304,50 @@ class SCDQueryExamples:
         
         # Get latest jobs for company
         jobs = self.job_scd.get_latest_records({'company_id': company_id})
-        job_uids = list(jobs.values_list('uid', flat=True))
+        job_uids = jobs.values('uid')
         
         # Get payment line items for that period
         payments = self.payment_scd.get_latest_records({
-            'job_uid__in': job_uids,
+            'job_id__in': job_uids,
             'status': 'paid'
         }).filter(payment_date__range=[start_date, end_date])
         
-        # Aggregate data
-        total_paid = sum(p.amount for p in payments)
-        job_breakdown = {}
-        
-        for payment in payments:
-            job_id = next(j.id for j in jobs if j.uid == payment.job_uid)
-            if job_id not in job_breakdown:
-                job_breakdown[job_id] = 0
-            job_breakdown[job_id] += payment.amount
+        # Aggregate in the database: one row for the totals and one row per
+        # job (grouped by the job's business ID) for the breakdown
+        totals = payments.aggregate(total_paid=Sum('amount'), payment_count=Count('uid'))
+        job_breakdown = {
+            job_id: _cents(total)
+            for job_id, total in payments.order_by().values_list('job__id').annotate(total=Sum('amount'))
+        }
         
         return {
             'period': f"{year}-{month:02d}",
-            'total_paid': total_paid,
-            'payment_count': len(payments),
+            'total_paid': _cents(totals['total_paid']),
+            'payment_count': totals['payment_count'],
             'job_breakdown': job_breakdown,
         }
+    
+    def get_company_spending_report_cached(self, company_id: str, month: int, year: int, timeout: int = 60):
+        """
+        Cached form of get_company_spending_report() for repeated polling.
+        
+        The key includes the Job and PaymentLineItem cache generations, so
+        writes through SCDAbstraction or a model save()/delete() invalidate
+        it. Writes that bypass both, such as QuerySet.bulk_create() or raw
+        SQL, are only seen once the timeout expires (see
+        SCDAbstraction.get_latest_records_cached()).
+        """
+        key = (
+            f"scd:report:{company_id}:{year}-{month:02d}:"
+            f"{self.job_scd.cache_generation()}:{self.payment_scd.cache_generation()}"
+        )
+        return cache.get_or_set(
+            key, lambda: self.get_company_spending_report(company_id, month, year), timeout
+        )
+
+
+# SCDQueryExamples holds no per-call state, so one instance is shared
+query_examples = SCDQueryExamples()
 
 
 # ============================================================================
@@ -321,7 +359,7 @@ def demonstrate_query_improvements():
     Function to demonstrate the before/after query improvements.
     Run this to see the actual SQL generated and performance differences.
     """
-    examples = SCDQueryExamples()
+    examples = query_examples
     
     print("=== SCD Query Abstraction Demo ===\n")
     
@@ -373,7 +411,7 @@ def run_performance_test():
     """
     import time
     
-    examples = SCDQueryExamples()
+    examples = query_examples
     company_id = "comp_test123"
     
     print("=== Performance Test ===")
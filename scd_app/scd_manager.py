@@ -5,17 +5,32 @@ This module provides a high-level abstraction for working with SCD models,
 hiding the complexity of version management and latest-version queries.
 """
 
+import datetime
+import functools
+import hashlib
 import logging
-from typing import Type, Dict, Any, List, Optional, Union
-from django.db import models, transaction
-from django.db.models import Max, Q, Subquery, OuterRef
+import secrets
+import uuid
+from decimal import Decimal
+from typing import Type, Dict, Any, List, Optional, Tuple, Union
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Exists, OuterRef, Subquery
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 
-from .models import SCDModelMixin
+from .models import SCDModelMixin, Job, Timelog, PaymentLineItem
 
 logger = logging.getLogger(__name__)
 
 
+# Filter values get_latest_records_cached() can key on by their repr()
+CACHEABLE_FILTER_TYPES = (
+    str, int, float, Decimal, type(None),
+    datetime.date, datetime.time, datetime.timedelta, uuid.UUID,
+)
+
+
 class SCDQuerySet(models.QuerySet):
     """
     Custom QuerySet for SCD models that provides helper methods
@@ -26,40 +41,28 @@ class SCDQuerySet(models.QuerySet):
         """
         Returns only the latest version of each record.
         
-        This is the core optimization - uses a subquery to efficiently
-        filter to only the latest version of each business ID.
+        This is the core optimization - a correlated NOT EXISTS keeps rows
+        with no newer version of the same business ID, so the whole filter
+        runs in the database as an anti-join on the (id, version) index.
         """
-        # Create a subquery to get the maximum version for each business ID
-        latest_versions_subquery = self.model.objects.values('id').annotate(
-            max_version=Max('version')
-        ).values('id', 'max_version')
-        
-        # Build filter conditions for the latest versions
-        latest_filter = Q()
-        for item in latest_versions_subquery:
-            latest_filter |= Q(id=item['id'], version=item['max_version'])
-        
-        return self.filter(latest_filter)
+        newer_version = self.model.objects.filter(
+            id=OuterRef('id'), version__gt=OuterRef('version')
+        )
+        return self.filter(~Exists(newer_version))
     
     def latest_versions_optimized(self):
         """
-        Optimized version using raw SQL for better performance on large datasets.
-        This approach is more efficient for millions of records.
-        """
-        model_table = self.model._meta.db_table
-        
-        raw_sql = f"""
-        SELECT t1.* FROM {model_table} t1
-        INNER JOIN (
-            SELECT id, MAX(version) as max_version 
-            FROM {model_table} 
-            GROUP BY id
-        ) t2 ON t1.id = t2.id AND t1.version = t2.max_version
+        Latest versions resolved with a single ordered index walk.
+        
+        On PostgreSQL the latest UIDs come from DISTINCT ON (id) ordered by
+        version DESC, which reads the (id, version DESC) index once instead
+        of probing it per row. Other backends fall back to latest_versions().
         """
+        if connections[self.db].vendor != 'postgresql':
+            return self.latest_versions()
         
-        return self.extra(
-            where=[f"{model_table}.uid IN (SELECT uid FROM ({raw_sql}) subq)"]
-        )
+        latest_uids = self.model.objects.order_by('id', '-version').distinct('id').values('uid')
+        return self.filter(uid__in=Subquery(latest_uids))
     
     def for_business_ids(self, business_ids: List[str]):
         """Filter by business IDs (not UIDs)"""
@@ -92,40 +95,169 @@ class SCDAbstraction:
     without having to understand the underlying version management complexity.
     """
     
+    # Fields set per version rather than carried forward by update_record()
+    VERSION_FIELDS = frozenset({'uid', 'version', 'created_at', 'updated_at'})
+    
     def __init__(self, model_class: Type[SCDModelMixin]):
         self.model_class = model_class
         self.model_name = model_class.__name__
+        # (name, attname) of the fields copied into each new version;
+        # copying by attname carries foreign keys over as their stored UID
+        # without fetching the related row
+        self._copy_fields = tuple(
+            (field.name, field.attname)
+            for field in model_class._meta.fields
+            if field.name not in self.VERSION_FIELDS
+        )
+        # Foreign keys followed by get_latest_records(with_related=True)
+        self._related_fields = tuple(
+            field.name for field in model_class._meta.fields if field.is_relation
+        )
+        # raw_latest() SQL, compiled once per combination of filter fields
+        self._raw_latest_sql = {}
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def for_model(cls, model_class: Type[SCDModelMixin]) -> 'SCDAbstraction':
+        """
+        Get the shared SCDAbstraction for a model class.
+        
+        The field introspection in __init__ then runs once per model per
+        process rather than on every instantiation.
+        """
+        return cls(model_class)
     
-    def get_latest_records(self, filters: Dict[str, Any] = None) -> models.QuerySet:
+    def get_latest_records(self, filters: Dict[str, Any] = None, with_related: bool = False) -> models.QuerySet:
         """
         Get latest versions of records with optional filtering.
         
         Args:
             filters: Django ORM filter dict (e.g., {'status': 'active'})
+            with_related: Join the referenced record versions (e.g. a
+                timelog's job) into the same query with select_related()
         
         Returns:
             QuerySet of latest version records
         """
-        # Get the latest version for each business ID
-        latest_versions_subquery = self.model_class.objects.values('id').annotate(
-            max_version=Max('version')
-        ).values('id', 'max_version')
-        
-        # Build filter conditions for the latest versions
-        latest_filter = Q()
-        for item in latest_versions_subquery:
-            latest_filter |= Q(id=item['id'], version=item['max_version'])
-        
-        # Start with the latest version filter
-        queryset = self.model_class.objects.filter(latest_filter)
+        # Only the latest version of each business ID carries is_current=True
+        queryset = self.model_class.objects.filter(is_current=True)
         
         # Apply additional filters if provided
         if filters:
             queryset = queryset.filter(**filters)
         
-        logger.debug(f"Getting latest {self.model_name} records with filters: {filters}")
+        if with_related and self._related_fields:
+            queryset = queryset.select_related(*self._related_fields)
+        
+        # Log the filter fields only: repr() of a subquery value would run it
+        logger.debug(f"Getting latest {self.model_name} records with filters on: {sorted(filters or {})}")
         return queryset
     
+    def raw_latest(self, **filters) -> models.query.RawQuerySet:
+        """
+        Latest records matching exact-value filters, without the ORM compiler.
+        
+        The SQL for each combination of filter fields is generated once and
+        reused with bound parameters, which skips per-call query compilation
+        on hot lookups. Only field=value equality is supported (field names or
+        attnames such as 'job_id'); use get_latest_records() for anything else.
+        
+        Returns:
+            RawQuerySet of latest version records
+        """
+        filter_fields = tuple(sorted(filters))
+        sql = self._raw_latest_sql.get(filter_fields)
+        if sql is None:
+            sql = self._raw_latest_sql[filter_fields] = self._compile_raw_latest_sql(filter_fields)
+        
+        connection = connections[self.model_class.objects.db]
+        params = [True] + [
+            self.model_class._meta.get_field(name).get_db_prep_value(filters[name], connection)
+            for name in filter_fields
+        ]
+        return self.model_class.objects.raw(sql, params)
+    
+    def _compile_raw_latest_sql(self, filter_fields) -> str:
+        opts = self.model_class._meta
+        quote_name = connections[self.model_class.objects.db].ops.quote_name
+        columns = ', '.join(quote_name(field.column) for field in opts.concrete_fields)
+        conditions = ' AND '.join(
+            f"{quote_name(opts.get_field(name).column)} = %s"
+            for name in ('is_current',) + filter_fields
+        )
+        return f"SELECT {columns} FROM {quote_name(opts.db_table)} WHERE {conditions}"
+    
+    def get_latest_records_cached(self, filters: Dict[str, Any] = None, timeout: int = 300) -> List[models.Model]:
+        """
+        Evaluated, cached form of get_latest_records().
+        
+        Cache keys include a per-model generation token that is replaced on
+        every write made through this class or a model save()/delete(), so
+        those writes invalidate all cached results for the model. Writes
+        that bypass both (QuerySet.bulk_create(), update(), raw SQL, or a
+        process not sharing this cache) are only picked up once the timeout
+        expires.
+        
+        Args:
+            filters: Django ORM filter dict (e.g., {'status': 'active'}); values
+                must be scalars or lists/tuples of scalars
+            timeout: Cache lifetime in seconds
+        
+        Returns:
+            List of latest version records
+        
+        Raises:
+            TypeError: If a filter value can't be part of a cache key, such as
+                a QuerySet (its repr() runs the query and is truncated)
+        """
+        generation = self.cache_generation()
+        filters_digest = hashlib.sha1(repr(self._cache_key_filters(filters)).encode()).hexdigest()
+        key = f"scd:{self.model_class._meta.label_lower}:{generation}:{filters_digest}"
+        return cache.get_or_set(key, lambda: list(self.get_latest_records(filters)), timeout)
+    
+    @staticmethod
+    def _cache_key_filters(filters: Optional[Dict[str, Any]]) -> List[Tuple[str, Any]]:
+        """Sorted (lookup, value) pairs with list values normalised to tuples"""
+        normalized = []
+        for lookup, value in sorted((filters or {}).items()):
+            values = value if isinstance(value, (list, tuple)) else (value,)
+            for item in values:
+                if not isinstance(item, CACHEABLE_FILTER_TYPES):
+                    raise TypeError(
+                        f"Cannot cache on filter {lookup!r}: "
+                        f"{type(item).__name__} values are not supported"
+                    )
+            normalized.append((lookup, tuple(value) if isinstance(value, list) else value))
+        return normalized
+    
+    def cache_generation(self) -> str:
+        """
+        Current cache generation token for this model.
+        
+        Every write made through this class replaces the token, so results
+        cached under a key that includes it go stale on the next write.
+        """
+        return cache.get_or_set(self._cache_generation_key(), self._new_cache_generation, None)
+    
+    def invalidate_cache(self):
+        """Invalidate every cached get_latest_records_cached() result for this model"""
+        cache.set(self._cache_generation_key(), self._new_cache_generation(), None)
+    
+    def _cache_generation_key(self) -> str:
+        return f"scd:{self.model_class._meta.label_lower}:generation"
+    
+    @staticmethod
+    def _new_cache_generation() -> str:
+        # Random rather than a counter so an evicted token can't resurrect
+        # entries cached under an earlier generation
+        return secrets.token_hex(8)
+    
+    def _invalidate_cache_after_write(self):
+        # Invalidate now for readers inside this transaction, and again on
+        # commit in case another process re-cached the pre-write state
+        self.invalidate_cache()
+        transaction.on_commit(self.invalidate_cache)
+    
     def get_by_business_id(self, business_id: str, version: Optional[int] = None) -> models.Model:
         """
         Get a specific record by business ID.
@@ -138,9 +270,8 @@ class SCDAbstraction:
             Model instance
         """
         if version is None:
-            # Get latest version using the abstraction method
-            latest_records = self.get_latest_records({'id': business_id})
-            return latest_records.first()
+            # Single seek on the (id, version DESC) index
+            return self.model_class.objects.filter(id=business_id).order_by('-version').first()
         else:
             # Get specific version
             return self.model_class.objects.get(id=business_id, version=version)
@@ -156,21 +287,64 @@ class SCDAbstraction:
         Returns:
             Created model instance
         """
-        # Check if business_id already exists
-        existing = self.model_class.objects.filter(id=business_id).exists()
-        if existing:
-            raise ValueError(f"Record with business_id '{business_id}' already exists. Use update_record() instead.")
-        
         record = self.model_class(
             id=business_id,
             version=1,
             **fields
         )
-        record.save()
+        # The (id, version) unique constraint rejects an existing business ID,
+        # so there is no separate existence check; the savepoint keeps an
+        # enclosing transaction usable after the failed INSERT
+        try:
+            with transaction.atomic():
+                record.save(force_insert=True)
+        except IntegrityError:
+            raise ValueError(
+                f"Record with business_id '{business_id}' already exists. Use update_record() instead."
+            ) from None
+        # save() fired post_save, which invalidated the cache
+        # (invalidate_cache_on_write)
         
         logger.info(f"Created new {self.model_name} record: {business_id} v1")
         return record
     
+    def bulk_create_initial(self, records: List[Dict[str, Any]], batch_size: int = 1000,
+                            created_at: Optional[datetime.datetime] = None) -> List[models.Model]:
+        """
+        Create many new SCD records (version 1) with batched INSERTs.
+        
+        bulk_create() bypasses save(), so UIDs are assigned here. Unlike
+        create_record() this does not check for existing business IDs.
+        
+        Args:
+            records: Field dicts, each including a 'business_id' key
+            batch_size: Number of rows per INSERT statement
+            created_at: Creation timestamp for every row (default: now)
+        
+        Returns:
+            List of created model instances
+        """
+        records = list(records)
+        created_at = created_at or timezone.now()
+        uids = self.model_class.generate_uids(len(records))
+        instances = []
+        for fields, uid in zip(records, uids):
+            fields = dict(fields)
+            business_id = fields.pop('business_id')
+            instances.append(self.model_class(
+                id=business_id,
+                version=1,
+                uid=uid,
+                created_at=created_at,
+                **fields
+            ))
+        
+        created = self.model_class.objects.bulk_create(instances, batch_size=batch_size)
+        self._invalidate_cache_after_write()
+        
+        logger.info(f"Bulk created {len(created)} new {self.model_name} records")
+        return created
+    
     def update_record(self, business_id: str, **updates) -> models.Model:
         """
         Update a record by creating a new version.
@@ -182,32 +356,99 @@ class SCDAbstraction:
         Returns:
             New version of the record
         """
-        # Get the latest version
-        try:
-            latest = self.get_by_business_id(business_id)
-            if not latest:
+        with transaction.atomic():
+            # Lock the latest version so concurrent writers serialize instead
+            # of both computing the same new version number
+            latest = self.model_class.objects.select_for_update().filter(
+                id=business_id
+            ).order_by('-version').first()
+            if latest is None:
                 raise ObjectDoesNotExist(f"No record found with business_id: {business_id}")
-        except ObjectDoesNotExist:
-            raise ObjectDoesNotExist(f"No record found with business_id: {business_id}")
+            
+            # Create new version
+            new_version = latest.version + 1
+            
+            # Copy all fields from latest version that are not being updated
+            new_record_data = {
+                attname: getattr(latest, attname)
+                for name, attname in self._copy_fields
+                if name not in updates and attname not in updates
+            }
+            
+            # Apply updates
+            new_record_data.update(updates)
+            new_record_data['version'] = new_version
+            new_record_data['is_current'] = True
+            
+            # Retire the current version before inserting its successor
+            self.model_class.objects.filter(
+                id=business_id, is_current=True
+            ).update(is_current=False)
+            
+            # A new version is always a fresh row: skip save()'s UPDATE attempt
+            new_record = self.model_class(**new_record_data)
+            new_record.save(force_insert=True)
+        # save() fired post_save, which invalidated the cache
+        # (invalidate_cache_on_write)
         
-        # Create new version
-        new_version = latest.version + 1
-        
-        # Copy all fields from latest version
-        new_record_data = {}
-        for field in self.model_class._meta.fields:
-            if field.name not in ['uid', 'version', 'created_at', 'updated_at']:
-                new_record_data[field.name] = getattr(latest, field.name)
+        logger.info(f"Updated {self.model_name} record: {business_id} v{latest.version} -> v{new_version}")
+        return new_record
+    
+    def bulk_update_records(self, updates: List[Tuple[str, Dict[str, Any]]], batch_size: int = 1000) -> List[models.Model]:
+        """
+        Create new versions for many records with batched INSERTs.
         
-        # Apply updates
-        new_record_data.update(updates)
-        new_record_data['version'] = new_version
+        The latest versions are fetched (and locked) with one query, every
+        successor is built in memory, and the whole batch is written with
+        bulk_create(). Each business ID may appear only once per call.
         
-        new_record = self.model_class(**new_record_data)
-        new_record.save()
+        Args:
+            updates: (business_id, field updates) pairs
+            batch_size: Number of rows per INSERT statement
         
-        logger.info(f"Updated {self.model_name} record: {business_id} v{latest.version} -> v{new_version}")
-        return new_record
+        Returns:
+            List of new version instances, in the order of updates
+        """
+        updates = list(updates)
+        business_ids = [business_id for business_id, _ in updates]
+        if len(set(business_ids)) != len(business_ids):
+            raise ValueError("Each business_id may only be updated once per bulk_update_records() call")
+        
+        created_at = timezone.now()
+        uids = self.model_class.generate_uids(len(updates))
+        
+        with transaction.atomic():
+            latest_map = {
+                record.id: record
+                for record in self.bulk_get_latest(business_ids).select_for_update()
+            }
+            missing = [business_id for business_id in business_ids if business_id not in latest_map]
+            if missing:
+                raise ObjectDoesNotExist(f"No record found with business_id: {', '.join(missing)}")
+            
+            new_records = []
+            for (business_id, changes), uid in zip(updates, uids):
+                latest = latest_map[business_id]
+                new_record_data = {
+                    attname: getattr(latest, attname)
+                    for name, attname in self._copy_fields
+                    if name not in changes and attname not in changes
+                }
+                new_record_data.update(changes)
+                new_record_data['version'] = latest.version + 1
+                new_record_data['is_current'] = True
+                new_records.append(self.model_class(uid=uid, created_at=created_at, **new_record_data))
+            
+            # Retire the current versions before inserting their successors
+            self.model_class.objects.filter(
+                uid__in=[record.uid for record in latest_map.values()]
+            ).update(is_current=False)
+            
+            created = self.model_class.objects.bulk_create(new_records, batch_size=batch_size)
+        self._invalidate_cache_after_write()
+        
+        logger.info(f"Bulk updated {len(created)} {self.model_name} records")
+        return created
     
     def get_version_history(self, business_id: str) -> models.QuerySet:
         """
@@ -221,19 +462,18 @@ class SCDAbstraction:
         """
         return self.model_class.objects.filter(id=business_id).order_by('version')
     
-    def bulk_get_latest(self, business_ids: List[str]) -> models.QuerySet:
+    def bulk_get_latest(self, business_ids: Union[List[str], models.QuerySet]) -> models.QuerySet:
         """
         Efficiently get latest versions for multiple business IDs.
         
         Args:
-            business_ids: List of business IDs
+            business_ids: List of business IDs, or a values('id') queryset
+                used as a subquery
         
         Returns:
             QuerySet of latest versions
         """
-        return self.model_class.objects.filter(
-            id__in=business_ids
-        ).latest_versions()
+        return self.get_latest_records({'id__in': business_ids})
 
 
 class SCDRelationshipHelper:
@@ -257,57 +497,64 @@ class SCDRelationshipHelper:
         Returns:
             Dict mapping UID to latest record
         """
-        # Get all related UIDs
-        related_uids = list(source_queryset.values_list(related_field, flat=True))
-        
-        # Get business IDs from UIDs
+        # Business IDs of the referenced versions, resolved as nested
+        # subqueries so the lookup is a single statement
         business_ids = related_model.objects.filter(
-            uid__in=related_uids
-        ).values_list('id', flat=True)
+            uid__in=source_queryset.values(related_field)
+        ).values('id')
         
         # Get latest versions
-        latest_records = SCDAbstraction(related_model).bulk_get_latest(list(business_ids))
-        
-        # Create mapping from UID to record
-        uid_to_record = {}
-        for record in latest_records:
-            uid_to_record[record.uid] = record
+        latest_records = SCDAbstraction.for_model(related_model).bulk_get_latest(business_ids)
         
-        return uid_to_record
+        # Create mapping from UID to record, streaming rather than caching
+        # the full result set
+        return {record.uid: record for record in latest_records.iterator(chunk_size=2000)}
+
+
+def invalidate_cache_on_write(sender, **kwargs):
+    """
+    post_save/post_delete receiver for the SCD models (connected in apps.py).
+    
+    Every save() and delete() invalidates cached results through here,
+    create_record() and update_record() included, as do the admin's. The
+    bulk paths bypass signals and call _invalidate_cache_after_write()
+    themselves.
+    """
+    SCDAbstraction.for_model(sender)._invalidate_cache_after_write()
+
+
+# Shared abstraction instances used by the convenience functions below
+_JOB_SCD = SCDAbstraction.for_model(Job)
+_TIMELOG_SCD = SCDAbstraction.for_model(Timelog)
+_PAYMENT_LINE_ITEM_SCD = SCDAbstraction.for_model(PaymentLineItem)
 
 
 # Convenience functions for common operations
 def get_latest_jobs(**filters) -> models.QuerySet:
     """Get latest version of jobs with optional filters"""
-    from .models import Job
-    return SCDAbstraction(Job).get_latest_records(filters)
+    return _JOB_SCD.get_latest_records(filters)
 
 
 def get_latest_timelogs(**filters) -> models.QuerySet:
     """Get latest version of timelogs with optional filters"""
-    from .models import Timelog
-    return SCDAbstraction(Timelog).get_latest_records(filters)
+    return _TIMELOG_SCD.get_latest_records(filters)
 
 
 def get_latest_payment_line_items(**filters) -> models.QuerySet:
     """Get latest version of payment line items with optional filters"""
-    from .models import PaymentLineItem
-    return SCDAbstraction(PaymentLineItem).get_latest_records(filters)
+    return _PAYMENT_LINE_ITEM_SCD.get_latest_records(filters)
 
 
 def update_job(business_id: str, **updates) -> models.Model:
     """Update a job by creating a new version"""
-    from .models import Job
-    return SCDAbstraction(Job).update_record(business_id, **updates)
+    return _JOB_SCD.update_record(business_id, **updates)
 
 
 def update_timelog(business_id: str, **updates) -> models.Model:
     """Update a timelog by creating a new version"""
-    from .models import Timelog
-    return SCDAbstraction(Timelog).update_record(business_id, **updates)
+    return _TIMELOG_SCD.update_record(business_id, **updates)
 
 
 def update_payment_line_item(business_id: str, **updates) -> models.Model:
     """Update a payment line item by creating a new version"""
-    from .models import PaymentLineItem
-    return SCDAbstraction(PaymentLineItem).update_record(business_id, **updates) 
\ No newline at end of file
+    return _PAYMENT_LINE_ITEM_SCD.update_record(business_id, **updates) 
\ No newline at end of file
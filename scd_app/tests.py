@@ -2,14 +2,20 @@
 Tests for SCD abstraction layer
 """
 
-from django.test import TestCase, Client
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.test import TestCase, RequestFactory
 from django.urls import reverse
-from datetime import datetime, timedelta
+from django.utils import timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
+import base64
 import json
+from decimal import Decimal
 
+from . import views
 from .models import Job, Timelog, PaymentLineItem, Company, Contractor
-from .scd_manager import SCDAbstraction, get_latest_jobs, get_latest_timelogs, get_latest_payment_line_items
-from .query_examples import SCDQueryExamples
+from .scd_manager import SCDAbstraction, SCDQuerySet, SCDRelationshipHelper, get_latest_jobs, get_latest_timelogs, get_latest_payment_line_items
+from .query_examples import query_examples
 
 
 class SCDModelTest(TestCase):
@@ -17,21 +23,17 @@ class SCDModelTest(TestCase):
     
     def setUp(self):
         """Set up test data"""
-        self.company = Company.objects.create(
-            id="comp_test123",
-            name="Test Company",
-            email="test@company.com"
-        )
-        
-        self.contractor = Contractor.objects.create(
-            id="cont_test456",
-            name="Test Contractor", 
-            email="test@contractor.com"
-        )
+        with transaction.atomic():
+            self.company, = Company.objects.bulk_create([
+                Company(id="comp_test123", name="Test Company", email="test@company.com")
+            ])
+            self.contractor, = Contractor.objects.bulk_create([
+                Contractor(id="cont_test456", name="Test Contractor", email="test@contractor.com")
+            ])
     
     def test_job_scd_creation(self):
         """Test creating new SCD job record"""
-        job_scd = SCDAbstraction(Job)
+        job_scd = SCDAbstraction.for_model(Job)
         
         # Create new job
         job = job_scd.create_record(
@@ -51,7 +53,7 @@ class SCDModelTest(TestCase):
     
     def test_job_scd_update(self):
         """Test updating SCD job record (creates new version)"""
-        job_scd = SCDAbstraction(Job)
+        job_scd = SCDAbstraction.for_model(Job)
         
         # Create initial job
         job_v1 = job_scd.create_record(
@@ -79,10 +81,14 @@ class SCDModelTest(TestCase):
         # Verify both versions exist
         self.assertTrue(Job.objects.filter(id="job_update_test", version=1).exists())
         self.assertTrue(Job.objects.filter(id="job_update_test", version=2).exists())
+        
+        # Only the new version is flagged as current
+        self.assertFalse(Job.objects.get(id="job_update_test", version=1).is_current)
+        self.assertTrue(job_v2.is_current)
     
     def test_latest_version_query(self):
         """Test getting latest versions of records"""
-        job_scd = SCDAbstraction(Job)
+        job_scd = SCDAbstraction.for_model(Job)
         
         # Create job with multiple versions
         job_v1 = job_scd.create_record(
@@ -97,18 +103,19 @@ class SCDModelTest(TestCase):
         job_v2 = job_scd.update_record("job_latest_test", rate=30.00)
         job_v3 = job_scd.update_record("job_latest_test", status="extended")
         
-        # Get latest version
-        latest_jobs = job_scd.get_latest_records()
+        # Get latest version; all versions collapse into a single query
+        with self.assertNumQueries(1):
+            latest_jobs = list(job_scd.get_latest_records())
         
         self.assertEqual(len(latest_jobs), 1)
-        latest_job = latest_jobs.first()
+        latest_job = latest_jobs[0]
         self.assertEqual(latest_job.version, 3)
         self.assertEqual(latest_job.status, "extended")
         self.assertEqual(latest_job.rate, 30.00)
     
     def test_multiple_jobs_latest_versions(self):
         """Test getting latest versions of multiple jobs"""
-        job_scd = SCDAbstraction(Job)
+        job_scd = SCDAbstraction.for_model(Job)
         
         # Create multiple jobs with different versions
         job1_v1 = job_scd.create_record(
@@ -130,20 +137,31 @@ class SCDModelTest(TestCase):
             contractor_id=self.contractor.id
         )
         
-        # Get latest versions
+        # Get latest versions, fetched once and keyed by business ID
         latest_jobs = job_scd.get_latest_records()
+        jobs_by_id = {job.id: job for job in latest_jobs}
         
-        self.assertEqual(len(latest_jobs), 2)
+        self.assertEqual(len(jobs_by_id), 2)
         
         # Check that we get the correct latest versions
-        job1_latest = latest_jobs.filter(id="job_multi_1").first()
-        job2_latest = latest_jobs.filter(id="job_multi_2").first()
+        self.assertEqual(jobs_by_id["job_multi_1"].version, 2)
+        self.assertEqual(jobs_by_id["job_multi_1"].rate, 25.00)
         
-        self.assertEqual(job1_latest.version, 2)
-        self.assertEqual(job1_latest.rate, 25.00)
+        self.assertEqual(jobs_by_id["job_multi_2"].version, 1)
+        self.assertEqual(jobs_by_id["job_multi_2"].rate, 30.00)
         
-        self.assertEqual(job2_latest.version, 1)
-        self.assertEqual(job2_latest.rate, 30.00)
+        # The version-based querysets and bulk lookup agree with is_current
+        expected = set(latest_jobs.values_list('uid', flat=True))
+        queryset = SCDQuerySet(Job)
+        self.assertEqual(set(queryset.latest_versions().values_list('uid', flat=True)), expected)
+        self.assertEqual(set(queryset.latest_versions_optimized().values_list('uid', flat=True)), expected)
+        self.assertEqual({job.uid for job in queryset.latest_versions_optimized().only('uid')}, expected)
+        self.assertEqual(
+            set(queryset.latest_versions_optimized().filter(id="job_multi_1").values_list('uid', flat=True)),
+            {job1_v2.uid}
+        )
+        bulk_latest = job_scd.bulk_get_latest(["job_multi_1", "job_multi_2"])
+        self.assertEqual(set(bulk_latest.values_list('uid', flat=True)), expected)
 
 
 class SCDAbstractionTest(TestCase):
@@ -151,61 +169,228 @@ class SCDAbstractionTest(TestCase):
     
     def setUp(self):
         """Set up test data"""
-        self.company = Company.objects.create(
-            id="comp_abstraction_test",
-            name="Abstraction Test Company",
-            email="test@abstraction.com"
-        )
+        with transaction.atomic():
+            self.company, = Company.objects.bulk_create([
+                Company(id="comp_abstraction_test", name="Abstraction Test Company",
+                        email="test@abstraction.com")
+            ])
+            self.contractor, = Contractor.objects.bulk_create([
+                Contractor(id="cont_abstraction_test", name="Abstraction Test Contractor",
+                           email="test@abstraction.com")
+            ])
+            
+            # Create test jobs
+            self.job1, self.job2 = SCDAbstraction.for_model(Job).bulk_create_initial([
+                {
+                    'business_id': "job_abs_1",
+                    'title': "Test Job 1",
+                    'status': "active",
+                    'rate': 25.00,
+                    'company_id': self.company.id,
+                    'contractor_id': self.contractor.id,
+                },
+                {
+                    'business_id': "job_abs_2",
+                    'title': "Test Job 2",
+                    'status': "extended",
+                    'rate': 30.00,
+                    'company_id': self.company.id,
+                    'contractor_id': self.contractor.id,
+                },
+            ])
+    
+    def test_convenience_functions(self):
+        """Test convenience functions for getting latest records"""
+        # Test get_latest_jobs
+        active_jobs = get_latest_jobs(status='active')
+        self.assertEqual(active_jobs.count(), 1)
+        self.assertEqual(active_jobs.first().id, "job_abs_1")
         
-        self.contractor = Contractor.objects.create(
-            id="cont_abstraction_test",
-            name="Abstraction Test Contractor",
-            email="test@abstraction.com"
-        )
+        extended_jobs = get_latest_jobs(status='extended')
+        self.assertEqual(extended_jobs.count(), 1)
+        self.assertEqual(extended_jobs.first().id, "job_abs_2")
         
-        # Create test jobs
-        job_scd = SCDAbstraction(Job)
-        self.job1 = job_scd.create_record(
-            business_id="job_abs_1",
-            title="Test Job 1",
+        company_jobs = get_latest_jobs(company_id=self.company.id)
+        self.assertEqual(company_jobs.count(), 2)
+        
+        contractor_jobs = get_latest_jobs(contractor_id=self.contractor.id)
+        self.assertEqual(contractor_jobs.count(), 2)
+    
+    def test_raw_latest(self):
+        """Test precompiled raw latest-record lookups match the ORM path"""
+        job_scd = SCDAbstraction.for_model(Job)
+        job_scd.create_record(
+            business_id="job_raw_1",
+            title="Raw Job",
             status="active",
             rate=25.00,
             company_id=self.company.id,
             contractor_id=self.contractor.id
         )
+        job_v2 = job_scd.update_record("job_raw_1", status="completed")
         
-        self.job2 = job_scd.create_record(
-            business_id="job_abs_2",
-            title="Test Job 2",
-            status="extended",
-            rate=30.00,
+        raw_jobs = list(job_scd.raw_latest(id="job_raw_1", status="completed"))
+        self.assertEqual([job.uid for job in raw_jobs], [job_v2.uid])
+        self.assertEqual(list(job_scd.raw_latest(id="job_raw_1", status="active")), [])
+        self.assertEqual(len(job_scd._raw_latest_sql), 1)
+    
+    def test_bulk_create_initial(self):
+        """Test creating many version-1 records in one batch"""
+        job_scd = SCDAbstraction.for_model(Job)
+        
+        created = job_scd.bulk_create_initial([
+            {
+                'business_id': f"job_bulk_{i}",
+                'title': f"Bulk Job {i}",
+                'status': "active",
+                'rate': 25.00,
+                'company_id': self.company.id,
+                'contractor_id': self.contractor.id,
+            }
+            for i in range(3)
+        ])
+        
+        self.assertEqual(len(created), 3)
+        for job in created:
+            self.assertEqual(job.version, 1)
+            self.assertTrue(job.uid.startswith("job_uid_"))
+            self.assertEqual(len(job.uid), len("job_uid_") + 20)
+        self.assertEqual(len({job.uid for job in created}), 3)
+        self.assertEqual(Job.objects.filter(id__startswith="job_bulk_").count(), 3)
+    
+    def test_create_record_rejects_existing_business_id(self):
+        """Test that creating an existing business ID raises ValueError"""
+        job_scd = SCDAbstraction.for_model(Job)
+        fields = dict(title="Duplicate Job", status="active", rate=25.00,
+                      company_id=self.company.id, contractor_id=self.contractor.id)
+        job_scd.create_record(business_id="job_duplicate_1", **fields)
+        
+        with self.assertRaises(ValueError):
+            job_scd.create_record(business_id="job_duplicate_1", **fields)
+        
+        # The failed INSERT leaves the surrounding transaction usable
+        self.assertEqual(Job.objects.filter(id="job_duplicate_1").count(), 1)
+    
+    def test_bulk_update_records(self):
+        """Test creating new versions for many records in one batch"""
+        job_scd = SCDAbstraction.for_model(Job)
+        for i in range(2):
+            job_scd.create_record(
+                business_id=f"job_bulk_update_{i}",
+                title=f"Bulk Update Job {i}",
+                status="active",
+                rate=25.00,
+                company_id=self.company.id,
+                contractor_id=self.contractor.id
+            )
+        
+        created = job_scd.bulk_update_records([
+            ("job_bulk_update_0", {'rate': 30.00}),
+            ("job_bulk_update_1", {'status': "completed"}),
+        ])
+        
+        self.assertEqual([job.version for job in created], [2, 2])
+        latest = {job.id: job for job in job_scd.bulk_get_latest(["job_bulk_update_0", "job_bulk_update_1"])}
+        self.assertEqual(latest["job_bulk_update_0"].rate, 30.00)
+        self.assertEqual(latest["job_bulk_update_0"].status, "active")
+        self.assertEqual(latest["job_bulk_update_1"].status, "completed")
+        self.assertEqual(Job.objects.filter(id__startswith="job_bulk_update_", is_current=True).count(), 2)
+        
+        with self.assertRaises(ObjectDoesNotExist):
+            job_scd.bulk_update_records([("job_missing", {'rate': 10.00})])
+    
+    def test_get_related_latest_records(self):
+        """Test resolving referenced records to their latest versions in one query"""
+        job_scd = SCDAbstraction.for_model(Job)
+        job_v1 = job_scd.create_record(
+            business_id="job_related_1",
+            title="Related Job",
+            status="active",
+            rate=25.00,
             company_id=self.company.id,
             contractor_id=self.contractor.id
         )
+        SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_related_1",
+            duration=3600000,
+            time_start=0,
+            time_end=3600000,
+            job_id=job_v1.uid
+        )
+        job_v2 = job_scd.update_record("job_related_1", status="extended")
+        
+        with self.assertNumQueries(1):
+            related = SCDRelationshipHelper.get_related_latest_records(
+                Timelog.objects.all(), 'job_id', Job
+            )
+        
+        self.assertEqual(list(related), [job_v2.uid])
+        self.assertEqual(related[job_v2.uid].status, "extended")
     
-    def test_convenience_functions(self):
-        """Test convenience functions for getting latest records"""
-        # Test get_latest_jobs
-        active_jobs = get_latest_jobs(status='active')
-        self.assertEqual(len(active_jobs), 1)
-        self.assertEqual(active_jobs.first().id, "job_abs_1")
+    def test_get_latest_records_cached(self):
+        """Test that cached latest records are invalidated by SCD writes"""
+        job_scd = SCDAbstraction.for_model(Job)
+        job_scd.create_record(
+            business_id="job_cached_1",
+            title="Cached Job",
+            status="active",
+            rate=25.00,
+            company_id=self.company.id,
+            contractor_id=self.contractor.id
+        )
+        filters = {'id': "job_cached_1"}
         
-        extended_jobs = get_latest_jobs(status='extended')
-        self.assertEqual(len(extended_jobs), 1)
-        self.assertEqual(extended_jobs.first().id, "job_abs_2")
+        cached = job_scd.get_latest_records_cached(filters)
+        self.assertEqual([job.version for job in cached], [1])
+        with self.assertNumQueries(0):
+            job_scd.get_latest_records_cached(filters)
         
-        company_jobs = get_latest_jobs(company_id=self.company.id)
-        self.assertEqual(len(company_jobs), 2)
+        # Each write invalidates once, registering a single on-commit hook
+        with self.captureOnCommitCallbacks() as callbacks:
+            job_scd.update_record("job_cached_1", rate=30.00)
+        self.assertEqual(len(callbacks), 1)
+        cached = job_scd.get_latest_records_cached(filters)
+        self.assertEqual([job.version for job in cached], [2])
         
-        contractor_jobs = get_latest_jobs(contractor_id=self.contractor.id)
-        self.assertEqual(len(contractor_jobs), 2)
+        # List values key like the equivalent tuple
+        self.assertEqual(
+            [job.uid for job in job_scd.get_latest_records_cached({'id__in': ["job_cached_1"]})],
+            [job.uid for job in job_scd.get_latest_records_cached({'id__in': ("job_cached_1",)})]
+        )
+        
+        # A QuerySet value would be evaluated (and truncated) by repr()
+        with self.assertNumQueries(0), self.assertRaises(TypeError):
+            job_scd.get_latest_records_cached({'uid__in': Job.objects.values('uid')})
+    
+    def test_insert_trigger_maintains_is_current(self):
+        """Test that versions inserted outside update_record() keep is_current consistent"""
+        job_scd = SCDAbstraction.for_model(Job)
+        job_v1 = job_scd.create_record(
+            business_id="job_trigger_1",
+            title="Trigger Job",
+            status="active",
+            rate=25.00,
+            company_id=self.company.id,
+            contractor_id=self.contractor.id
+        )
+        
+        # Insert v3 before v2: v3 supersedes v1, and v2 arrives already stale
+        fields = dict(title="Trigger Job", status="active", rate=25.00,
+                      company_id=self.company.id, contractor_id=self.contractor.id)
+        Job.objects.bulk_create([Job(id="job_trigger_1", version=3, uid=Job.generate_uid(), **fields)])
+        Job.objects.bulk_create([Job(id="job_trigger_1", version=2, uid=Job.generate_uid(), **fields)])
+        
+        current = Job.objects.filter(id="job_trigger_1", is_current=True)
+        self.assertEqual(list(current.values_list('version', flat=True)), [3])
+        job_v1.refresh_from_db()
+        self.assertFalse(job_v1.is_current)
     
     def test_timelog_scd_operations(self):
         """Test SCD operations on Timelog model"""
-        timelog_scd = SCDAbstraction(Timelog)
+        timelog_scd = SCDAbstraction.for_model(Timelog)
         
         # Create timelog
-        start_time = int(datetime.now().timestamp() * 1000)
+        start_time = 1700000000000  # 2023-11-14 22:13:20 UTC, in milliseconds
         end_time = start_time + 3600000  # 1 hour later
         
         timelog_v1 = timelog_scd.create_record(
@@ -214,11 +399,15 @@ class SCDAbstractionTest(TestCase):
             time_start=start_time,
             time_end=end_time,
             type="captured",
-            job_uid=self.job1.uid
+            job_id=self.job1.uid
         )
         
         self.assertEqual(timelog_v1.type, "captured")
         self.assertEqual(timelog_v1.duration, 3600000)
+        self.assertEqual(timelog_v1.time_start, 1700000000000)
+        self.assertEqual(timelog_v1.start_datetime, datetime(2023, 11, 14, 22, 13, 20, tzinfo=dt_timezone.utc))
+        self.assertEqual(timelog_v1.duration_timedelta, timedelta(hours=1))
+        self.assertEqual(timelog_v1.end_datetime - timelog_v1.start_datetime, timedelta(hours=1))
         
         # Update timelog (adjust duration)
         timelog_v2 = timelog_scd.update_record(
@@ -230,23 +419,36 @@ class SCDAbstractionTest(TestCase):
         self.assertEqual(timelog_v2.version, 2)
         self.assertEqual(timelog_v2.type, "adjusted")
         self.assertEqual(timelog_v2.duration, 3000000)
+        self.assertEqual(timelog_v2.job_id, self.job1.uid)
         
         # Verify latest version
         latest_timelogs = get_latest_timelogs()
-        self.assertEqual(len(latest_timelogs), 1)
+        self.assertEqual(latest_timelogs.count(), 1)
         self.assertEqual(latest_timelogs.first().version, 2)
+        
+        # The job reference is copied as its UID; the Job row is not fetched
+        with self.assertNumQueries(5):  # savepoint, locking select, retire, insert, release
+            timelog_scd.update_record(business_id="timelog_test_1", description="Reviewed")
     
     def test_payment_line_item_scd(self):
         """Test SCD operations on PaymentLineItem model"""
-        payment_scd = SCDAbstraction(PaymentLineItem)
+        payment_scd = SCDAbstraction.for_model(PaymentLineItem)
+        timelog = SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_test_1",
+            duration=3600000,
+            time_start=0,
+            time_end=3600000,
+            type="captured",
+            job_id=self.job1.uid
+        )
         
         # Create payment line item
         payment_v1 = payment_scd.create_record(
             business_id="payment_test_1",
             amount=100.00,
             status="not-paid",
-            job_uid=self.job1.uid,
-            timelog_uid="timelog_uid_test"
+            job_id=self.job1.uid,
+            timelog_id=timelog.uid
         )
         
         self.assertEqual(payment_v1.status, "not-paid")
@@ -265,160 +467,538 @@ class SCDAbstractionTest(TestCase):
         
         # Verify latest version
         latest_payments = get_latest_payment_line_items()
-        self.assertEqual(len(latest_payments), 1)
+        self.assertEqual(latest_payments.count(), 1)
         self.assertEqual(latest_payments.first().status, "paid")
+        
+        # Referenced versions can be joined into the same query
+        with self.assertNumQueries(1):
+            payment = payment_scd.get_latest_records(with_related=True).get()
+            self.assertEqual(payment.job.title, self.job1.title)
+            self.assertEqual(payment.timelog.uid, timelog.uid)
 
 
 class SCDQueryExamplesTest(TestCase):
     """Test the query examples and patterns"""
     
-    def setUp(self):
-        """Set up comprehensive test data"""
-        # Create companies and contractors
-        self.company1 = Company.objects.create(
-            id="comp_query_1", name="Query Company 1", email="query1@test.com"
-        )
-        self.company2 = Company.objects.create(
-            id="comp_query_2", name="Query Company 2", email="query2@test.com"
-        )
-        
-        self.contractor1 = Contractor.objects.create(
-            id="cont_query_1", name="Query Contractor 1", email="cont1@test.com"
-        )
-        self.contractor2 = Contractor.objects.create(
-            id="cont_query_2", name="Query Contractor 2", email="cont2@test.com"
-        )
-        
-        # Create jobs with multiple versions
-        job_scd = SCDAbstraction(Job)
-        
-        # Company 1 jobs
-        self.job1 = job_scd.create_record(
-            business_id="job_query_1",
-            title="Job 1",
-            status="active",
-            rate=25.00,
-            company_id=self.company1.id,
-            contractor_id=self.contractor1.id
-        )
-        
-        self.job2 = job_scd.create_record(
-            business_id="job_query_2",
-            title="Job 2",
-            status="extended",
-            rate=30.00,
-            company_id=self.company1.id,
-            contractor_id=self.contractor2.id
-        )
-        
-        # Company 2 jobs
-        self.job3 = job_scd.create_record(
-            business_id="job_query_3",
-            title="Job 3",
-            status="active",
-            rate=35.00,
-            company_id=self.company2.id,
-            contractor_id=self.contractor1.id
-        )
-        
-        self.examples = SCDQueryExamples()
+    # Two companies and two contractors; jobs 1 and 2 belong to company 1,
+    # job 3 to company 2, and contractor 1 works jobs 1 and 3
+    fixtures = ['query_examples.json']
+    examples = query_examples
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Look up the fixture rows the tests refer to"""
+        cls.company1, cls.company2 = Company.objects.order_by('id')
+        cls.contractor1, cls.contractor2 = Contractor.objects.order_by('id')
+        cls.job1, cls.job2, cls.job3 = Job.objects.order_by('id')
     
     def test_query_pattern_1_jobs_by_company(self):
         """Test Query Pattern 1: Get all active Jobs for a company"""
         # Test with company 1
         active_jobs_c1 = self.examples.get_active_jobs_for_company_new_way(self.company1.id)
-        self.assertEqual(len(active_jobs_c1), 1)
-        self.assertEqual(active_jobs_c1.first().id, "job_query_1")
+        self.assertEqual([job.id for job in active_jobs_c1], ["job_query_1"])
         
         # Test with company 2
         active_jobs_c2 = self.examples.get_active_jobs_for_company_new_way(self.company2.id)
-        self.assertEqual(len(active_jobs_c2), 1)
-        self.assertEqual(active_jobs_c2.first().id, "job_query_3")
+        self.assertEqual([job.id for job in active_jobs_c2], ["job_query_3"])
         
         # Test convenience function
         convenience_jobs = self.examples.get_active_jobs_for_company_convenience(self.company1.id)
-        self.assertEqual(len(convenience_jobs), 1)
+        self.assertEqual(convenience_jobs.count(), 1)
     
     def test_query_pattern_2_jobs_by_contractor(self):
         """Test Query Pattern 2: Get all active Jobs for a contractor"""
         # Contractor 1 has jobs from both companies
         contractor1_jobs = self.examples.get_active_jobs_for_contractor_new_way(self.contractor1.id)
-        self.assertEqual(len(contractor1_jobs), 2)  # job1 and job3
+        self.assertEqual(contractor1_jobs.count(), 2)  # job1 and job3
         
         # Contractor 2 has one extended job (not active)
         contractor2_jobs = self.examples.get_active_jobs_for_contractor_new_way(self.contractor2.id)
-        self.assertEqual(len(contractor2_jobs), 0)  # No active jobs
+        self.assertEqual(contractor2_jobs.count(), 0)  # No active jobs
+    
+    def test_query_pattern_4_old_and_new_way_agree(self):
+        """Test Query Pattern 4: the manual and abstracted timelog queries match"""
+        timelog_scd = SCDAbstraction.for_model(Timelog)
+        timelog_scd.create_record(
+            business_id="timelog_query_1",
+            duration=3600000,
+            time_start=1000,
+            time_end=3601000,
+            job_id=self.job1.uid
+        )
+        timelog_scd.update_record("timelog_query_1", duration=1800000, type="adjusted")
+        
+        old_way = self.examples.get_timelogs_for_contractor_old_way(self.contractor1.id, 0, 10000000)
+        new_way = self.examples.get_timelogs_for_contractor_new_way(self.contractor1.id, 0, 10000000)
+        
+        self.assertEqual([t.uid for t in old_way], [t.uid for t in new_way])
+        self.assertEqual([t.version for t in old_way], [2])
     
     def test_dashboard_data_retrieval(self):
         """Test contractor dashboard data retrieval"""
-        dashboard_data = self.examples.get_contractor_dashboard_data(self.contractor1.id, days_back=30)
+        start_time = int((timezone.now() - timedelta(days=1)).timestamp() * 1000)
+        timelog = SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_dashboard",
+            duration=3600000,
+            time_start=start_time,
+            time_end=start_time + 3600000,
+            type="captured",
+            job_id=self.job1.uid
+        )
+        # Neither amount is exact in binary floating point
+        for business_id, amount in [("payment_dashboard_1", "0.10"), ("payment_dashboard_2", "0.20")]:
+            SCDAbstraction.for_model(PaymentLineItem).create_record(
+                business_id=business_id,
+                amount=Decimal(amount),
+                status="paid",
+                job_id=self.job1.uid,
+                timelog_id=timelog.uid
+            )
+        
+        with self.assertNumQueries(2):  # total hours and total amount aggregates
+            dashboard_data = self.examples.get_contractor_dashboard_data(self.contractor1.id, days_back=30)
         
         self.assertIn('jobs', dashboard_data)
         self.assertIn('timelogs', dashboard_data)
         self.assertIn('payment_items', dashboard_data)
         self.assertIn('total_hours', dashboard_data)
         self.assertIn('total_amount', dashboard_data)
+        self.assertEqual(dashboard_data['total_hours'], 1)
+        self.assertEqual(str(dashboard_data['total_amount']), "0.30")
+        
+        # Reading every field the dashboard renders is one query per
+        # queryset, never a deferred-field or related-object query per row
+        with self.assertNumQueries(3):
+            jobs = [(job.id, job.title, job.status, job.rate) for job in dashboard_data['jobs']]
+            timelogs = [(timelog.id, timelog.duration, timelog.type) for timelog in dashboard_data['timelogs']]
+            payments = [(payment.id, payment.amount, payment.status) for payment in dashboard_data['payment_items']]
         
         # Should have 2 jobs for contractor 1
-        self.assertEqual(len(dashboard_data['jobs']), 2)
+        self.assertEqual(len(jobs), 2)
+        self.assertEqual(timelogs, [("timelog_dashboard", 3600000, "captured")])
+        self.assertEqual(sorted(payments), [
+            ("payment_dashboard_1", Decimal("0.10"), "paid"),
+            ("payment_dashboard_2", Decimal("0.20"), "paid"),
+        ])
+    
+    def test_company_spending_report(self):
+        """Test the company spending report aggregates"""
+        timelog = SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_report_1",
+            duration=3600000,
+            time_start=0,
+            time_end=3600000,
+            job_id=self.job1.uid
+        )
+        payment_scd = SCDAbstraction.for_model(PaymentLineItem)
+        payment_date = timezone.make_aware(datetime(2024, 3, 15, 12))
+        for business_id, amount, status in [
+            ("payment_report_1", 100, "paid"),
+            ("payment_report_2", 50, "paid"),
+            ("payment_report_3", 70, "not-paid"),
+        ]:
+            payment_scd.create_record(
+                business_id=business_id,
+                amount=amount,
+                status=status,
+                payment_date=payment_date,
+                job_id=self.job1.uid,
+                timelog_id=timelog.uid
+            )
+        
+        # One aggregate query for the totals, one GROUP BY joined to jobs
+        with self.assertNumQueries(2):
+            report = self.examples.get_company_spending_report(self.company1.id, 3, 2024)
+        
+        self.assertEqual(report['period'], "2024-03")
+        # Totals keep the stored two decimal places whatever SUM() returns
+        self.assertEqual(str(report['total_paid']), "150.00")
+        self.assertEqual(report['payment_count'], 2)
+        self.assertEqual({k: str(v) for k, v in report['job_breakdown'].items()}, {"job_query_1": "150.00"})
+        
+        # The cached form serves repeats without queries until an SCD write
+        self.assertEqual(self.examples.get_company_spending_report_cached(self.company1.id, 3, 2024), report)
+        with self.assertNumQueries(0):
+            self.examples.get_company_spending_report_cached(self.company1.id, 3, 2024)
+        
+        payment_scd.update_record("payment_report_2", amount=80)
+        report = self.examples.get_company_spending_report_cached(self.company1.id, 3, 2024)
+        self.assertEqual(report['total_paid'], 180)
+        
+        # A plain save(), as the admin makes, invalidates it too
+        PaymentLineItem(
+            id="payment_report_4",
+            version=1,
+            amount=20,
+            status="paid",
+            payment_date=payment_date,
+            job_id=self.job1.uid,
+            timelog_id=timelog.uid
+        ).save()
+        report = self.examples.get_company_spending_report_cached(self.company1.id, 3, 2024)
+        self.assertEqual(report['total_paid'], 200)
 
 
 class SCDAPITest(TestCase):
     """Test the API endpoints"""
     
     def setUp(self):
-        """Set up test data and client"""
-        self.client = Client()
+        """Set up test data and request factory"""
+        # Views are called directly; only test_index_endpoint goes through
+        # the test client to check the URL wiring
+        self.factory = RequestFactory()
         
         # Create test data
-        self.company = Company.objects.create(
-            id="comp_api_test", name="API Test Company", email="api@test.com"
-        )
-        self.contractor = Contractor.objects.create(
-            id="cont_api_test", name="API Test Contractor", email="api@test.com"
-        )
-        
-        job_scd = SCDAbstraction(Job)
-        self.job = job_scd.create_record(
-            business_id="job_api_test",
-            title="API Test Job",
-            status="active",
-            rate=25.00,
-            company_id=self.company.id,
-            contractor_id=self.contractor.id
-        )
+        with transaction.atomic():
+            self.company, = Company.objects.bulk_create([
+                Company(id="comp_api_test", name="API Test Company", email="api@test.com")
+            ])
+            self.contractor, = Contractor.objects.bulk_create([
+                Contractor(id="cont_api_test", name="API Test Contractor", email="api@test.com")
+            ])
+            self.job, = SCDAbstraction.for_model(Job).bulk_create_initial([{
+                'business_id': "job_api_test",
+                'title': "API Test Job",
+                'status': "active",
+                'rate': 25.00,
+                'company_id': self.company.id,
+                'contractor_id': self.contractor.id,
+            }])
     
     def test_index_endpoint(self):
-        """Test the index endpoint"""
+        """Test the index endpoint through the full URL and middleware stack"""
         response = self.client.get('/api/')
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.content)
+        data = response.json()
         self.assertIn('message', data)
         self.assertIn('endpoints', data)
     
+    def test_dashboard_gzip_negotiation(self):
+        """Test the dashboard is gzipped only for clients that accept it"""
+        # Enough rows to clear GZipMiddleware's 200 byte minimum
+        start_time = int((timezone.now() - timedelta(days=1)).timestamp() * 1000)
+        SCDAbstraction.for_model(Timelog).bulk_create_initial([{
+            'business_id': f"timelog_gzip_{i}",
+            'duration': 3600000,
+            'time_start': start_time,
+            'time_end': start_time + 3600000,
+            'type': "captured",
+            'job_id': self.job.uid,
+        } for i in range(5)])
+        url = f'/api/dashboard/contractor/{self.contractor.id}/'
+        
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.json()['contractor_id'], self.contractor.id)
+    
+    def test_stream_json_batches(self):
+        """Test rows spanning several encoder batches stream as one JSON array"""
+        for total in (0, 1, views.STREAM_BATCH_SIZE, 2 * views.STREAM_BATCH_SIZE + 1):
+            rows = ({'n': n} for n in range(total))
+            body = b''.join(views._stream_json({'page': 1}, 'rows', rows, lambda count: {'count': count}))
+            self.assertEqual(json.loads(body), {
+                'page': 1,
+                'rows': [{'n': n} for n in range(total)],
+                'count': total,
+            })
+    
+    def test_malformed_business_id_is_not_routed(self):
+        """Test IDs without the company/contractor prefix 404 before any query"""
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/jobs/company/not-a-company/').status_code, 404)
+            self.assertEqual(self.client.get(f'/api/jobs/contractor/{self.company.id}/').status_code, 404)
+        
+        self.assertEqual(
+            reverse('scd_app:jobs_by_company', kwargs={'company_id': self.company.id}),
+            f'/api/jobs/company/{self.company.id}/'
+        )
+    
     def test_demo_endpoint(self):
         """Test the demo endpoint"""
-        response = self.client.get('/api/demo/')
+        # The demo only renders SQL for lazy querysets; nothing is executed
+        with self.assertNumQueries(0):
+            response = views.demo_queries(self.factory.get('/api/demo/'))
         self.assertEqual(response.status_code, 200)
         
         data = json.loads(response.content)
         self.assertIn('message', data)
         self.assertIn('benefits', data)
     
+    def test_jobs_list_endpoint(self):
+        """Test the streamed all-jobs endpoint"""
+        response = views.jobs_list(self.factory.get('/api/jobs/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['jobs'][0]['id'], 'job_api_test')
+        self.assertEqual(data['jobs'][0]['rate'], '25.00')
+    
+    def test_timelogs_by_contractor_endpoint(self):
+        """Test the streamed Query Pattern 4 endpoint and its trailing totals"""
+        start_time = int((timezone.now() - timedelta(days=1)).timestamp() * 1000)
+        SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_api_test",
+            duration=5400000,
+            time_start=start_time,
+            time_end=start_time + 5400000,
+            type="captured",
+            job_id=self.job.uid
+        )
+        
+        request = self.factory.get(f'/api/timelogs/contractor/{self.contractor.id}/')
+        response = views.timelogs_by_contractor(request, contractor_id=self.contractor.id)
+        self.assertEqual(response.status_code, 200)
+        
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(data['contractor_id'], self.contractor.id)
+        date_range = data['date_range']
+        self.assertAlmostEqual(
+            datetime.fromisoformat(date_range['end_date']) - datetime.fromisoformat(date_range['start_date']),
+            timedelta(days=date_range['days_back']),
+            delta=timedelta(milliseconds=1)
+        )
+        self.assertEqual([t['id'] for t in data['timelogs']], ['timelog_api_test'])
+        self.assertEqual(data['timelogs'][0]['job_uid'], self.job.uid)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['total_hours'], 1.5)
+        
+        # Summary mode returns the same totals from one aggregate query
+        request = self.factory.get(f'/api/timelogs/contractor/{self.contractor.id}/', {'summary': '1'})
+        with self.assertNumQueries(1):
+            response = views.timelogs_by_contractor(request, contractor_id=self.contractor.id)
+        data = json.loads(response.content)
+        self.assertNotIn('timelogs', data)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['total_hours'], 1.5)
+    
+    def test_payments_by_contractor_endpoint(self):
+        """Test Query Pattern 3 endpoint"""
+        now = timezone.now()
+        start_time = int((now - timedelta(days=1)).timestamp() * 1000)
+        timelog = SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_api_payment",
+            duration=3600000,
+            time_start=start_time,
+            time_end=start_time + 3600000,
+            job_id=self.job.uid
+        )
+        SCDAbstraction.for_model(PaymentLineItem).create_record(
+            business_id="payment_api_test",
+            amount=25.00,
+            status="paid",
+            payment_date=now,
+            notes="Not part of the response",
+            job_id=self.job.uid,
+            timelog_id=timelog.uid
+        )
+        
+        request = self.factory.get(f'/api/payments/contractor/{self.contractor.id}/')
+        with self.assertNumQueries(2):  # totals aggregate, then the page of rows
+            response = views.payments_by_contractor(request, contractor_id=self.contractor.id)
+        self.assertEqual(response.status_code, 200)
+        
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['total_amount'], '25.00')
+        payment = data['payments'][0]
+        self.assertEqual(payment['id'], 'payment_api_test')
+        self.assertEqual(payment['amount'], '25.00')
+        self.assertEqual(payment['job_uid'], self.job.uid)
+        self.assertEqual(payment['timelog_uid'], timelog.uid)
+        self.assertNotIn('notes', payment)
+    
     def test_jobs_by_company_endpoint(self):
         """Test Query Pattern 1 endpoint"""
-        response = self.client.get(f'/api/jobs/company/{self.company.id}/')
+        request = self.factory.get(f'/api/jobs/company/{self.company.id}/')
+        response = views.jobs_by_company(request, company_id=self.company.id)
         self.assertEqual(response.status_code, 200)
         
         data = json.loads(response.content)
         self.assertEqual(data['company_id'], self.company.id)
         self.assertEqual(len(data['jobs']), 1)
         self.assertEqual(data['jobs'][0]['id'], 'job_api_test')
+        self.assertEqual(data['jobs'][0]['rate'], '25.00')
+        self.assertEqual(data['jobs'][0]['created_at'], self.job.created_at.isoformat())
+    
+    def test_jobs_by_company_keyset_pagination(self):
+        """Test pages follow next_cursor newest first until a short page"""
+        SCDAbstraction.for_model(Job).bulk_create_initial([{
+            'business_id': f"job_api_page_{n}",
+            'title': "Paged Job",
+            'status': "active",
+            'rate': 25.00,
+            'company_id': self.company.id,
+            'contractor_id': self.contractor.id,
+        } for n in range(2)])
+        path = f'/api/jobs/company/{self.company.id}/'
+        
+        seen = []
+        cursor = None
+        for expected_count in (2, 1):
+            params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+            response = views.jobs_by_company(self.factory.get(path, params), company_id=self.company.id)
+            data = json.loads(response.content)
+            self.assertEqual(data['count'], expected_count)
+            seen += [job['id'] for job in data['jobs']]
+            cursor = data['next_cursor']
+        
+        self.assertIsNone(cursor)
+        self.assertEqual(sorted(seen), ["job_api_page_0", "job_api_page_1", "job_api_test"])
+        self.assertEqual(seen[-1], "job_api_test")  # the oldest job comes last
+    
+    def test_malformed_page_parameters(self):
+        """Test a bad ?limit= or ?cursor= is a 400 rather than a server error"""
+        not_a_pair = base64.urlsafe_b64encode(b'[1]').decode()
+        bad_date = base64.urlsafe_b64encode(b'["yesterday","job_uid"]').decode()
+        for params in ({'limit': 'ten'}, {'cursor': '!!!'}, {'cursor': 'bm90IGpzb24='},
+                       {'cursor': not_a_pair}, {'cursor': bad_date}):
+            request = self.factory.get(f'/api/jobs/contractor/{self.contractor.id}/', params)
+            with self.assertNumQueries(0):
+                response = views.jobs_by_contractor(request, contractor_id=self.contractor.id)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', json.loads(response.content))
+        
+        request = self.factory.get(f'/api/payments/contractor/{self.contractor.id}/', {'cursor': '!!!'})
+        response = views.payments_by_contractor(request, contractor_id=self.contractor.id)
+        self.assertEqual(response.status_code, 400)
+    
+    def test_company_report_endpoint(self):
+        """Test the report serializes money totals in cents"""
+        now = timezone.now()
+        timelog = SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_api_report",
+            duration=3600000,
+            time_start=0,
+            time_end=3600000,
+            job_id=self.job.uid
+        )
+        # Neither amount is exact in binary floating point
+        SCDAbstraction.for_model(PaymentLineItem).bulk_create_initial([{
+            'business_id': business_id,
+            'amount': Decimal(amount),
+            'status': "paid",
+            'payment_date': now,
+            'job_id': self.job.uid,
+            'timelog_id': timelog.uid,
+        } for business_id, amount in [("payment_report_a", "0.10"), ("payment_report_b", "0.20")]])
+        
+        request = self.factory.get(f'/api/report/company/{self.company.id}/', {'month': now.month, 'year': now.year})
+        response = views.company_report(request, company_id=self.company.id)
+        self.assertEqual(response.status_code, 200)
+        
+        report = json.loads(response.content)['report']
+        self.assertEqual(report['total_paid'], "0.30")
+        self.assertEqual(report['payment_count'], 2)
+        self.assertEqual(report['job_breakdown'], {"job_api_test": "0.30"})
+    
+    def test_company_report_invalid_period(self):
+        """Test an out-of-range month or year is a JSON error, not an unhandled one"""
+        path = f'/api/report/company/{self.company.id}/'
+        for params in ({'month': 13}, {'month': 0}, {'month': 'May'}, {'month': 1, 'year': 0}):
+            response = views.company_report(self.factory.get(path, params), company_id=self.company.id)
+            self.assertEqual(response.status_code, 500, params)
+            self.assertIn('error', json.loads(response.content))
+    
+    def test_jobs_by_company_conditional_get(self):
+        """Test a matching If-None-Match gets a 304 until a new version is written"""
+        path = f'/api/jobs/company/{self.company.id}/'
+        response = views.jobs_by_company(self.factory.get(path), company_id=self.company.id)
+        etag = response['ETag']
+        
+        request = self.factory.get(path, HTTP_IF_NONE_MATCH=etag)
+        with self.assertNumQueries(1):  # the MAX(created_at) behind the ETag
+            response = views.jobs_by_company(request, company_id=self.company.id)
+        self.assertEqual(response.status_code, 304)
+        
+        SCDAbstraction.for_model(Job).update_record("job_api_test", rate=30.00)
+        request = self.factory.get(path, HTTP_IF_NONE_MATCH=etag)
+        response = views.jobs_by_company(request, company_id=self.company.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(json.loads(response.content)['jobs'][0]['version'], 2)
+        
+        # An in-place edit, as the admin's change form makes, leaves
+        # created_at alone but still moves the ETag; so does a delete
+        job = Job.objects.get(id="job_api_test", is_current=True)
+        job.title = "Edited in place"
+        for write in (job.save, job.delete):
+            etag = response['ETag']
+            write()
+            request = self.factory.get(path, HTTP_IF_NONE_MATCH=etag)
+            response = views.jobs_by_company(request, company_id=self.company.id)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+    
+    def test_error_responses_carry_no_etag(self):
+        """Test conditional views set no ETag on 4xx/5xx responses"""
+        request = self.factory.get(f'/api/jobs/company/{self.company.id}/', {'limit': 'abc'})
+        response = views.jobs_by_company(request, company_id=self.company.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('ETag'))
+        
+        request = self.factory.get(f'/api/dashboard/contractor/{self.contractor.id}/', {'days': 'x'})
+        response = views.contractor_dashboard(request, contractor_id=self.contractor.id)
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.has_header('ETag'))
+    
+    def test_company_report_conditional_get(self):
+        """Test the report's ETag moves only together with its cached body"""
+        now = timezone.now()
+        timelog = SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_api_report_etag",
+            duration=3600000,
+            time_start=0,
+            time_end=3600000,
+            job_id=self.job.uid
+        )
+        payment_fields = {
+            'status': "paid",
+            'payment_date': now,
+            'job_id': self.job.uid,
+            'timelog_id': timelog.uid,
+        }
+        SCDAbstraction.for_model(PaymentLineItem).create_record(
+            business_id="payment_report_etag_1", amount=Decimal("1.00"), **payment_fields
+        )
+        path = f'/api/report/company/{self.company.id}/'
+        params = {'month': now.month, 'year': now.year}
+        
+        response = views.company_report(self.factory.get(path, params), company_id=self.company.id)
+        etag = response['ETag']
+        self.assertEqual(json.loads(response.content)['report']['total_paid'], "1.00")
+        
+        request = self.factory.get(path, params, HTTP_IF_NONE_MATCH=etag)
+        with self.assertNumQueries(0):  # the ETag hashes the cached report
+            response = views.company_report(request, company_id=self.company.id)
+        self.assertEqual(response.status_code, 304)
+        
+        # A bulk_create() the cache can't see leaves body and ETag unchanged
+        # together, rather than pairing the old body with a new ETag
+        PaymentLineItem.objects.bulk_create([PaymentLineItem(
+            id="payment_report_etag_2", version=1, amount=Decimal("5.00"), **payment_fields
+        )])
+        request = self.factory.get(path, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(views.company_report(request, company_id=self.company.id).status_code, 304)
+        
+        SCDAbstraction.for_model(PaymentLineItem).update_record("payment_report_etag_1", amount=Decimal("2.00"))
+        request = self.factory.get(path, params, HTTP_IF_NONE_MATCH=etag)
+        response = views.company_report(request, company_id=self.company.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(json.loads(response.content)['report']['total_paid'], "7.00")
     
     def test_jobs_by_contractor_endpoint(self):
         """Test Query Pattern 2 endpoint"""
-        response = self.client.get(f'/api/jobs/contractor/{self.contractor.id}/')
+        request = self.factory.get(f'/api/jobs/contractor/{self.contractor.id}/')
+        response = views.jobs_by_contractor(request, contractor_id=self.contractor.id)
         self.assertEqual(response.status_code, 200)
         
         data = json.loads(response.content)
@@ -427,55 +1007,126 @@ class SCDAPITest(TestCase):
     
     def test_contractor_dashboard_endpoint(self):
         """Test contractor dashboard endpoint"""
-        response = self.client.get(f'/api/dashboard/contractor/{self.contractor.id}/')
+        timelog = SCDAbstraction.for_model(Timelog).create_record(
+            business_id="timelog_api_dashboard",
+            duration=3600000,
+            time_start=int((timezone.now() - timedelta(days=1)).timestamp() * 1000),
+            time_end=int(timezone.now().timestamp() * 1000),
+            job_id=self.job.uid
+        )
+        # Neither amount is exact in binary floating point
+        SCDAbstraction.for_model(PaymentLineItem).bulk_create_initial([{
+            'business_id': business_id,
+            'amount': Decimal(amount),
+            'status': "paid",
+            'job_id': self.job.uid,
+            'timelog_id': timelog.uid,
+        } for business_id, amount in [("payment_api_dashboard_1", "0.10"), ("payment_api_dashboard_2", "0.20")]])
+        
+        request = self.factory.get(f'/api/dashboard/contractor/{self.contractor.id}/')
+        with self.assertNumQueries(6):  # ETag, two aggregates, then jobs, timelogs and payments
+            response = views.contractor_dashboard(request, contractor_id=self.contractor.id)
         self.assertEqual(response.status_code, 200)
         
         data = json.loads(response.content)
         self.assertEqual(data['contractor_id'], self.contractor.id)
         self.assertIn('summary', data)
-        self.assertIn('jobs', data)
+        self.assertEqual(data['jobs'], [{
+            'id': 'job_api_test', 'version': 1, 'title': 'API Test Job', 'status': 'active', 'rate': '25.00',
+        }])
+        
+        request = self.factory.get(f'/api/dashboard/contractor/{self.contractor.id}/', {'summary': '1'})
+        with self.assertNumQueries(4):  # ETag, two aggregates and the job count
+            response = views.contractor_dashboard(request, contractor_id=self.contractor.id)
+        data = json.loads(response.content)
+        self.assertEqual(data['summary']['total_jobs'], 1)
+        self.assertEqual(data['summary']['total_amount'], "0.30")
+        self.assertNotIn('jobs', data)
 
 
 class SCDPerformanceTest(TestCase):
     """Test performance aspects of SCD abstraction"""
     
-    def test_bulk_latest_version_query(self):
-        """Test bulk operations for latest versions"""
-        job_scd = SCDAbstraction(Job)
+    @staticmethod
+    def _build_job_versions(business_id, base_kwargs, updates_list):
+        """
+        Build unsaved Job instances for a full version chain.
         
-        # Create multiple jobs with versions
-        company_id = "comp_perf_test"
-        contractor_id = "cont_perf_test"
+        Each version carries forward the previous version's fields, as
+        update_record() does, so the chain can be saved with bulk_create().
+        """
+        versions = []
+        fields = dict(base_kwargs)
+        latest_version = len(updates_list) + 1
+        for version, updates in enumerate([{}] + updates_list, start=1):
+            fields.update(updates)
+            versions.append(Job(
+                id=business_id,
+                version=version,
+                uid=f"job_uid_{business_id}_{version}",
+                is_current=(version == latest_version),
+                **fields
+            ))
+        return versions
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Create the shared fixtures once for the whole class"""
+        cls.perf_company_id = "comp_perf_test"
+        cls.filter_company_id = "comp_filter_test"
         
-        Company.objects.create(id=company_id, name="Perf Test", email="perf@test.com")
-        Contractor.objects.create(id=contractor_id, name="Perf Test", email="perf@test.com")
+        Company.objects.bulk_create([
+            Company(id=cls.perf_company_id, name="Perf Test", email="perf@test.com"),
+            Company(id=cls.filter_company_id, name="Filter Test", email="filter@test.com"),
+        ])
+        Contractor.objects.bulk_create(
+            [Contractor(id="cont_perf_test", name="Perf Test", email="perf@test.com")] + [
+                Contractor(id=f"cont_filter_{i}", name=f"Contractor {i}", email=f"cont{i}@test.com")
+                for i in range(5)
+            ]
+        )
         
-        # Create 10 jobs with 3 versions each
+        # 10 jobs with 3 versions each, in one batched INSERT
+        all_versions = []
         for i in range(10):
-            business_id = f"job_perf_{i}"
-            
-            # Version 1
-            job_v1 = job_scd.create_record(
-                business_id=business_id,
-                title=f"Job {i}",
-                status="active",
-                rate=20.00,
-                company_id=company_id,
-                contractor_id=contractor_id
-            )
-            
-            # Version 2
-            job_v2 = job_scd.update_record(business_id, rate=25.00)
-            
-            # Version 3
-            job_v3 = job_scd.update_record(business_id, status="extended")
+            all_versions.extend(cls._build_job_versions(
+                f"job_perf_{i}",
+                {
+                    'title': f"Job {i}",
+                    'status': "active",
+                    'rate': 20.00,
+                    'company_id': cls.perf_company_id,
+                    'contractor_id': "cont_perf_test",
+                },
+                [{'rate': 25.00}, {'status': "extended"}]
+            ))
+        Job.objects.bulk_create(all_versions, batch_size=1000)
         
+        # 5 single-version jobs with different statuses, one contractor each
+        SCDAbstraction.for_model(Job).bulk_create_initial([
+            {
+                'business_id': f"job_filter_{i}",
+                'title': f"Job {i}",
+                'status': "active" if i % 2 == 0 else "extended",
+                'rate': 25.00,
+                'company_id': cls.filter_company_id,
+                'contractor_id': f"cont_filter_{i}",
+            }
+            for i in range(5)
+        ])
+    
+    def test_bulk_version_count(self):
+        """Test that every version of every job is stored"""
         # Should have 30 total job records (10 * 3 versions)
-        total_jobs = Job.objects.count()
+        total_jobs = Job.objects.filter(company_id=self.perf_company_id).count()
         self.assertEqual(total_jobs, 30)
+    
+    def test_bulk_latest_version_query(self):
+        """Test bulk operations for latest versions"""
+        job_scd = SCDAbstraction.for_model(Job)
         
         # Should get 10 latest versions
-        latest_jobs = job_scd.get_latest_records()
+        latest_jobs = job_scd.get_latest_records({'company_id': self.perf_company_id})
         self.assertEqual(len(latest_jobs), 10)
         
         # All should be version 3
@@ -486,32 +1137,14 @@ class SCDPerformanceTest(TestCase):
     
     def test_query_with_filters_performance(self):
         """Test performance of filtered queries"""
-        job_scd = SCDAbstraction(Job)
-        
-        company_id = "comp_filter_test"
-        Company.objects.create(id=company_id, name="Filter Test", email="filter@test.com")
-        
-        # Create jobs with different statuses
-        for i in range(5):
-            contractor_id = f"cont_filter_{i}"
-            Contractor.objects.create(
-                id=contractor_id, name=f"Contractor {i}", email=f"cont{i}@test.com"
-            )
-            
-            job_scd.create_record(
-                business_id=f"job_filter_{i}",
-                title=f"Job {i}",
-                status="active" if i % 2 == 0 else "extended",
-                rate=25.00,
-                company_id=company_id,
-                contractor_id=contractor_id
-            )
+        job_scd = SCDAbstraction.for_model(Job)
+        company_id = self.filter_company_id
         
         # Test filtered queries
-        active_jobs = job_scd.get_latest_records({'status': 'active'})
-        extended_jobs = job_scd.get_latest_records({'status': 'extended'})
+        active_jobs = job_scd.get_latest_records({'status': 'active', 'company_id': company_id})
+        extended_jobs = job_scd.get_latest_records({'status': 'extended', 'company_id': company_id})
         company_jobs = job_scd.get_latest_records({'company_id': company_id})
         
-        self.assertEqual(len(active_jobs), 3)  # Jobs 0, 2, 4
-        self.assertEqual(len(extended_jobs), 2)  # Jobs 1, 3
-        self.assertEqual(len(company_jobs), 5)  # All jobs 
\ No newline at end of file
+        self.assertEqual(active_jobs.count(), 3)  # Jobs 0, 2, 4
+        self.assertEqual(extended_jobs.count(), 2)  # Jobs 1, 3
+        self.assertEqual(company_jobs.count(), 5)  # All jobs
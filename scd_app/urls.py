@@ -2,8 +2,11 @@
 URL patterns for SCD app
 """
 
-from django.urls import path
-from . import views
+from django.urls import path, register_converter
+from . import converters, views
+
+register_converter(converters.CompanyIDConverter, 'company_id')
+register_converter(converters.ContractorIDConverter, 'contractor_id')
 
 app_name = 'scd_app'
 
@@ -11,10 +14,10 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('demo/', views.demo_queries, name='demo'),
     path('jobs/', views.jobs_list, name='jobs'),
-    path('jobs/company/<str:company_id>/', views.jobs_by_company, name='jobs_by_company'),
-    path('jobs/contractor/<str:contractor_id>/', views.jobs_by_contractor, name='jobs_by_contractor'),
-    path('timelogs/contractor/<str:contractor_id>/', views.timelogs_by_contractor, name='timelogs_by_contractor'),
-    path('payments/contractor/<str:contractor_id>/', views.payments_by_contractor, name='payments_by_contractor'),
-    path('dashboard/contractor/<str:contractor_id>/', views.contractor_dashboard, name='contractor_dashboard'),
-    path('report/company/<str:company_id>/', views.company_report, name='company_report'),
+    path('jobs/company/<company_id:company_id>/', views.jobs_by_company, name='jobs_by_company'),
+    path('jobs/contractor/<contractor_id:contractor_id>/', views.jobs_by_contractor, name='jobs_by_contractor'),
+    path('timelogs/contractor/<contractor_id:contractor_id>/', views.timelogs_by_contractor, name='timelogs_by_contractor'),
+    path('payments/contractor/<contractor_id:contractor_id>/', views.payments_by_contractor, name='payments_by_contractor'),
+    path('dashboard/contractor/<contractor_id:contractor_id>/', views.contractor_dashboard, name='contractor_dashboard'),
+    path('report/company/<company_id:company_id>/', views.company_report, name='company_report'),
 ] 
\ No newline at end of file
@@ -2,19 +2,260 @@
 Django views demonstrating SCD abstraction usage
 """
 
-import json
+import base64
+import functools
+import hashlib
+import itertools
+import time
 from datetime import datetime, timedelta
-from django.http import JsonResponse
+from decimal import Decimal
+
+import orjson
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.views.decorators.http import condition, require_http_methods
+
+from .models import Job, Timelog, PaymentLineItem
+from .query_examples import CENTS, query_examples, demonstrate_query_improvements
+from .scd_manager import SCDAbstraction, get_latest_jobs, get_latest_timelogs, get_latest_payment_line_items
+
+
+def _orjson_default(obj):
+    """Encode the types orjson leaves to the caller; Decimals become strings"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(data):
+    return orjson.dumps(data, default=_orjson_default)
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    JsonResponse equivalent that encodes with orjson.
+    
+    datetimes, dates and UUIDs are serialized natively (ISO 8601) and
+    Decimals as strings, so views pass model values through unconverted.
+    """
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=_dumps(data), **kwargs)
+
+
+# Timelog durations and time bounds are stored in milliseconds
+MS_PER_HOUR = 60 * 60 * 1000
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+# Job columns returned by the jobs endpoints, in response key order
+JOB_FIELDS = (
+    'id', 'version', 'uid', 'title', 'status', 'rate',
+    'company_id', 'contractor_id', 'created_at',
+)
+
+
+# Timelog columns read by timelogs_by_contractor, in unpacking order
+TIMELOG_FIELDS = (
+    'id', 'version', 'uid', 'duration', 'time_start', 'time_end',
+    'type', 'job_id', 'created_at',
+)
+
+
+# Payment columns read by payments_by_contractor, in unpacking order
+PAYMENT_FIELDS = (
+    'id', 'version', 'uid', 'amount', 'status', 'job_id', 'timelog_id',
+    'payment_date', 'created_at',
+)
+
+
+# Rows per page of the list endpoints: ?limit= defaults to and is capped at
+PAGE_LIMIT_DEFAULT = 100
+PAGE_LIMIT_MAX = 1000
+
+
+# Rows encoded per orjson.dumps() call when streaming a list
+STREAM_BATCH_SIZE = 500
+
+
+class _InvalidPage(Exception):
+    """A ?limit= or ?cursor= the client sent that _KeysetPage can't use"""
 
-from .query_examples import SCDQueryExamples, demonstrate_query_improvements
-from .scd_manager import get_latest_jobs, get_latest_timelogs, get_latest_payment_line_items
+
+class _KeysetPage:
+    """
+    One page of a latest-version queryset, newest first.
+    
+    Pages follow (created_at, uid) keyset order rather than OFFSET, so each
+    page is a bounded seek however deep the client pages. ?limit= sets the
+    page size and ?cursor= takes the next_cursor of the previous page.
+    Malformed values raise _InvalidPage, which views answer with a 400.
+    """
+    
+    def __init__(self, request, queryset):
+        try:
+            self.limit = max(1, min(int(request.GET.get('limit', PAGE_LIMIT_DEFAULT)), PAGE_LIMIT_MAX))
+        except ValueError:
+            raise _InvalidPage("limit must be an integer") from None
+        cursor = request.GET.get('cursor')
+        if cursor:
+            try:
+                created_at, uid = orjson.loads(base64.urlsafe_b64decode(cursor))
+                created_at = datetime.fromisoformat(created_at)
+                if not isinstance(uid, str):
+                    raise TypeError(uid)
+            except (ValueError, TypeError):
+                raise _InvalidPage("cursor must be a next_cursor returned by this endpoint") from None
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, uid__lt=uid)
+            )
+        self.queryset = queryset.order_by('-created_at', '-uid')[:self.limit]
+        self.count = 0
+        self._last_row = None
+    
+    def track(self, rows):
+        """Pass serialized rows through, noting the last one for next_cursor"""
+        for row in rows:
+            self.count += 1
+            self._last_row = row
+            yield row
+    
+    @property
+    def next_cursor(self):
+        """Cursor for the following page; None once a short page shows the end"""
+        if self.count < self.limit:
+            return None
+        key = _dumps([self._last_row['created_at'], self._last_row['uid']])
+        return base64.urlsafe_b64encode(key).decode()
+
+
+def _summary_only(request):
+    """Whether the request asked for totals without the row list (?summary=1)"""
+    return request.GET.get('summary') == '1'
+
+
+def _latest_versions_etag(*model_classes, scope=''):
+    """
+    ETag for a body read live from the SCD models, plus a scope string.
+    
+    Each model's SCDAbstraction cache generation is replaced by every
+    save(), delete() and SCD bulk write, again on commit, so in-place admin
+    edits, deletes and late-committing transactions all move the ETag. The
+    newest created_at is hashed in as well, for inserts the generation
+    doesn't see: QuerySet.bulk_create(), raw SQL, and processes that don't
+    share the cache. The per-model MAX() reads off the created_at index
+    are made in one query.
+    """
+    generations = [SCDAbstraction.for_model(model_class).cache_generation() for model_class in model_classes]
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(
+        f"(SELECT MAX({quote_name('created_at')}) FROM {quote_name(model_class._meta.db_table)})"
+        for model_class in model_classes
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {columns}")
+        stamps = cursor.fetchone()
+    return hashlib.blake2b(repr((generations, stamps, scope)).encode(), digest_size=16).hexdigest()
+
+
+def _conditional(etag_func):
+    """
+    condition(etag_func=...) that sets the ETag on successful responses only.
+    
+    condition() stamps the ETag on whatever the view returns, which would
+    let a client cache a 400 or 500 body and revalidate it to a 304.
+    """
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func)(view_func)
+        
+        @functools.wraps(view_func)
+        def inner(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if response.status_code >= 400:
+                response.headers.pop('ETag', None)
+            return response
+        return inner
+    return decorator
+
+
+def _jobs_by_company_etag(request, company_id):
+    return _latest_versions_etag(Job)
+
+
+def _contractor_dashboard_etag(request, contractor_id):
+    # The dashboard window is snapped to the hour, so its rows can change
+    # as the hour turns over without any new version being written
+    hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+    return _latest_versions_etag(Job, Timelog, PaymentLineItem, scope=hour.isoformat())
+
+
+def _report_period(request):
+    """
+    company_report's (month, year); without parameters, the current month.
+    
+    Raises ValueError for parameters that aren't integers or a valid month.
+    """
+    today = datetime.now()
+    month = int(request.GET.get('month', today.month))
+    year = int(request.GET.get('year', today.year))
+    if not 1 <= month <= 12:
+        raise ValueError("month must be in 1..12")
+    return month, year
+
+
+def _company_report_etag(request, company_id):
+    # The report body is served from get_company_spending_report_cached(),
+    # so the ETag hashes that same cached report: it can only change along
+    # with the body it validates. A live MAX(created_at) would move on
+    # writes the cache hasn't seen yet and leave clients a stale body under
+    # a fresh ETag.
+    try:
+        month, year = _report_period(request)
+        report_data = query_examples.get_company_spending_report_cached(company_id, month, year)
+    except ValueError:
+        # Bad parameters (an out-of-range year fails only in the report's
+        # own datetime()); no ETag, and the view reports the error
+        return None
+    return hashlib.blake2b(_dumps(report_data), digest_size=16).hexdigest()
+
+
+def _job_rows(jobs):
+    """
+    Iterate a jobs queryset as dicts of the JOB_FIELDS columns.
+    
+    Rows are read with values(), skipping Job instance construction, and
+    are encoded as-is by OrjsonResponse and _stream_json().
+    """
+    return jobs.values(*JOB_FIELDS).iterator(chunk_size=2000)
+
+
+def _stream_json(head, key, rows, tail):
+    """
+    Yield the JSON object {**head, key: [*rows], **tail(count)} in fragments.
+    
+    Rows are encoded in batches of STREAM_BATCH_SIZE as the database cursor
+    produces them, so the full list is never held in memory and the encoder
+    is entered once per batch rather than once per row. tail is called with
+    the row count once the rows are exhausted, so it can report totals
+    gathered on the way.
+    """
+    yield _dumps(head)[:-1] + (b',' if head else b'') + _dumps(key) + b':['
+    count = 0
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, STREAM_BATCH_SIZE)):
+        # Strip the batch's brackets to splice it into the open array
+        yield (b',' if count else b'') + _dumps(batch)[1:-1]
+        count += len(batch)
+    yield b'],' + _dumps(tail(count))[1:]
 
 
 def index(request):
     """Basic info about the SCD implementation"""
-    return JsonResponse({
+    return OrjsonResponse({
         'message': 'SCD Work Trial - Django Implementation',
         'description': 'Abstraction layer for Slowly Changing Dimensions',
         'endpoints': [
@@ -30,41 +271,52 @@ def index(request):
     })
 
 
+@functools.lru_cache(maxsize=1)
+def _demo_sql(end_date):
+    """
+    SQL text shown by demo_queries for a payments window ending at end_date.
+    
+    Compiling the three querysets is the whole cost of the demo, so the text
+    is kept until the hour-snapped window end moves on.
+    """
+    company_id = "comp_demo123"
+    contractor_id = "cont_demo456"
+    
+    # Only the SQL text is wanted; neither job queryset is ever evaluated,
+    # so there is no scan to share between them
+    old_jobs = query_examples.get_active_jobs_for_company_old_way(company_id)
+    new_jobs = query_examples.get_active_jobs_for_company_new_way(company_id)
+    
+    # Get payment line items
+    start_date = end_date - timedelta(days=30)
+    payments = query_examples.get_payment_line_items_for_contractor_optimized(
+        contractor_id, start_date, end_date
+    )
+    
+    # Safely get SQL queries
+    def get_sql_safe(queryset):
+        try:
+            return str(queryset.query)
+        except Exception:
+            return "(empty queryset)"
+    
+    return {
+        'old_jobs_sql': get_sql_safe(old_jobs),
+        'new_jobs_sql': get_sql_safe(new_jobs),
+        'payments_sql': get_sql_safe(payments),
+    }
+
+
 def demo_queries(request):
     """Demonstrate the SCD abstraction with example queries"""
     try:
-        # Create examples directly without printing
-        examples = SCDQueryExamples()
-        company_id = "comp_demo123"
-        contractor_id = "cont_demo456"
+        # Window end snapped up to the hour, as in the contractor dashboard
+        end_date = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
         
-        # Get the query results
-        old_jobs = examples.get_active_jobs_for_company_old_way(company_id)
-        new_jobs = examples.get_active_jobs_for_company_new_way(company_id)
-        
-        # Get payment line items
-        from datetime import datetime, timedelta
-        start_date = datetime.now() - timedelta(days=30)
-        end_date = datetime.now()
-        payments = examples.get_payment_line_items_for_contractor_optimized(
-            contractor_id, start_date, end_date
-        )
-        
-        # Safely get SQL queries
-        def get_sql_safe(queryset):
-            try:
-                return str(queryset.query)
-            except Exception:
-                return "(empty queryset)"
-        
-        return JsonResponse({
+        return OrjsonResponse({
             'message': 'SCD Query Demonstration',
             'note': 'This shows how the abstraction simplifies complex SCD queries',
-            'examples': {
-                'old_jobs_sql': get_sql_safe(old_jobs),
-                'new_jobs_sql': get_sql_safe(new_jobs),
-                'payments_sql': get_sql_safe(payments),
-            },
+            'examples': _demo_sql(end_date),
             'benefits': [
                 'Simplified query syntax',
                 'Automatic latest version filtering',
@@ -74,7 +326,7 @@ def demo_queries(request):
             ]
         })
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
@@ -82,32 +334,26 @@ def jobs_list(request):
     """Get all latest version jobs"""
     try:
         # Using the abstraction
-        jobs = get_latest_jobs()
+        page = _KeysetPage(request, get_latest_jobs())
         
-        jobs_data = []
-        for job in jobs:
-            jobs_data.append({
-                'id': job.id,
-                'version': job.version,
-                'uid': job.uid,
-                'title': job.title,
-                'status': job.status,
-                'rate': str(job.rate),
-                'company_id': job.company_id,
-                'contractor_id': job.contractor_id,
-                'created_at': job.created_at.isoformat(),
-            })
-        
-        return JsonResponse({
-            'jobs': jobs_data,
-            'count': len(jobs_data),
-            'note': 'All latest versions using SCD abstraction'
-        })
+        # Streamed: a database error mid-stream aborts the response instead
+        # of producing the 500 body below
+        return StreamingHttpResponse(
+            _stream_json({}, 'jobs', page.track(_job_rows(page.queryset)), lambda count: {
+                'count': count,
+                'next_cursor': page.next_cursor,
+                'note': 'All latest versions using SCD abstraction'
+            }),
+            content_type='application/json'
+        )
+    except _InvalidPage as e:
+        return OrjsonResponse({'error': str(e)}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
+@_conditional(_jobs_by_company_etag)
 def jobs_by_company(request, company_id):
     """
     QUERY PATTERN 1: Get all active Jobs for a company (latest version filtering)
@@ -117,30 +363,22 @@ def jobs_by_company(request, company_id):
         
         # Using SCD abstraction - simple and clean
         jobs = get_latest_jobs(company_id=company_id, status=status_filter)
+        page = _KeysetPage(request, jobs)
         
-        jobs_data = []
-        for job in jobs:
-            jobs_data.append({
-                'id': job.id,
-                'version': job.version,
-                'uid': job.uid,
-                'title': job.title,
-                'status': job.status,
-                'rate': str(job.rate),
-                'company_id': job.company_id,
-                'contractor_id': job.contractor_id,
-                'created_at': job.created_at.isoformat(),
-            })
+        jobs_data = list(page.track(_job_rows(page.queryset)))
         
-        return JsonResponse({
+        return OrjsonResponse({
             'company_id': company_id,
             'status_filter': status_filter,
             'jobs': jobs_data,
             'count': len(jobs_data),
+            'next_cursor': page.next_cursor,
             'note': 'Query Pattern 1: Latest jobs for company using SCD abstraction'
         })
+    except _InvalidPage as e:
+        return OrjsonResponse({'error': str(e)}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
@@ -153,30 +391,22 @@ def jobs_by_contractor(request, contractor_id):
         
         # Using SCD abstraction
         jobs = get_latest_jobs(contractor_id=contractor_id, status=status_filter)
+        page = _KeysetPage(request, jobs)
         
-        jobs_data = []
-        for job in jobs:
-            jobs_data.append({
-                'id': job.id,
-                'version': job.version,
-                'uid': job.uid,
-                'title': job.title,
-                'status': job.status,
-                'rate': str(job.rate),
-                'company_id': job.company_id,
-                'contractor_id': job.contractor_id,
-                'created_at': job.created_at.isoformat(),
-            })
+        jobs_data = list(page.track(_job_rows(page.queryset)))
         
-        return JsonResponse({
+        return OrjsonResponse({
             'contractor_id': contractor_id,
             'status_filter': status_filter,
             'jobs': jobs_data,
             'count': len(jobs_data),
+            'next_cursor': page.next_cursor,
             'note': 'Query Pattern 2: Latest jobs for contractor using SCD abstraction'
         })
+    except _InvalidPage as e:
+        return OrjsonResponse({'error': str(e)}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
@@ -187,48 +417,72 @@ def timelogs_by_contractor(request, contractor_id):
     try:
         # Get date range from query params
         days_back = int(request.GET.get('days', 30))
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
-        start_timestamp = int(start_date.timestamp() * 1000)
-        end_timestamp = int(end_date.timestamp() * 1000)
+        # The filter bounds are epoch milliseconds, so work from time.time()
+        # and only build datetimes for the response's date_range
+        end_s = time.time()
+        start_s = end_s - days_back * SECONDS_PER_DAY
+        start_timestamp = int(start_s * 1000)
+        end_timestamp = int(end_s * 1000)
         
         # Use SCD abstraction
-        examples = SCDQueryExamples()
-        timelogs = examples.get_timelogs_for_contractor_new_way(
+        timelogs = query_examples.get_timelogs_for_contractor_new_way(
             contractor_id, start_timestamp, end_timestamp
         )
         
-        timelogs_data = []
-        total_duration = 0
-        for timelog in timelogs:
-            timelogs_data.append({
-                'id': timelog.id,
-                'version': timelog.version,
-                'uid': timelog.uid,
-                'duration': timelog.duration,
-                'duration_hours': round(timelog.duration / (1000 * 60 * 60), 2),
-                'time_start': timelog.time_start,
-                'time_end': timelog.time_end,
-                'type': timelog.type,
-                'job_uid': timelog.job_uid,
-                'created_at': timelog.created_at.isoformat(),
-            })
-            total_duration += timelog.duration
+        def timelog_rows(page):
+            # Plain values_list() tuples unpack straight into the response
+            # dict, with no intermediate per-row dict
+            rows = page.queryset.values_list(*TIMELOG_FIELDS).iterator(chunk_size=2000)
+            for business_id, version, uid, duration, time_start, time_end, timelog_type, job_uid, created_at in rows:
+                yield {
+                    'id': business_id,
+                    'version': version,
+                    'uid': uid,
+                    'duration': duration,
+                    'duration_hours': round(duration / MS_PER_HOUR, 2),
+                    'time_start': time_start,
+                    'time_end': time_end,
+                    'type': timelog_type,
+                    'job_uid': job_uid,
+                    'created_at': created_at,
+                }
         
-        return JsonResponse({
+        head = {
             'contractor_id': contractor_id,
             'date_range': {
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
+                'start_date': datetime.fromtimestamp(start_s),
+                'end_date': datetime.fromtimestamp(end_s),
                 'days_back': days_back
             },
-            'timelogs': timelogs_data,
-            'count': len(timelogs_data),
-            'total_hours': round(total_duration / (1000 * 60 * 60), 2),
-            'note': 'Query Pattern 4: Latest timelogs for contractor in time period'
-        })
+        }
+        # Totals cover the whole period, not just the page, and are summed
+        # by the database
+        totals = timelogs.aggregate(count=Count('uid'), total_duration=Sum('duration'))
+        total_hours = round((totals['total_duration'] or 0) / MS_PER_HOUR, 2)
+        if _summary_only(request):
+            # No timelog rows are fetched
+            return OrjsonResponse({
+                **head,
+                'count': totals['count'],
+                'total_hours': total_hours,
+                'note': 'Query Pattern 4: Latest timelogs for contractor in time period'
+            })
+        
+        # Streamed like jobs_list; the totals follow the last row
+        page = _KeysetPage(request, timelogs)
+        return StreamingHttpResponse(
+            _stream_json(head, 'timelogs', page.track(timelog_rows(page)), lambda count: {
+                'count': count,
+                'next_cursor': page.next_cursor,
+                'total_hours': total_hours,
+                'note': 'Query Pattern 4: Latest timelogs for contractor in time period'
+            }),
+            content_type='application/json'
+        )
+    except _InvalidPage as e:
+        return OrjsonResponse({'error': str(e)}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
@@ -243,44 +497,70 @@ def payments_by_contractor(request, contractor_id):
         start_date = end_date - timedelta(days=days_back)
         
         # Use SCD abstraction
-        examples = SCDQueryExamples()
-        payments = examples.get_payment_line_items_for_contractor_optimized(
+        payments = query_examples.get_payment_line_items_for_contractor_optimized(
             contractor_id, start_date, end_date
         )
         
-        payments_data = []
-        total_amount = 0
-        for payment in payments:
-            payments_data.append({
-                'id': payment.id,
-                'version': payment.version,
-                'uid': payment.uid,
-                'amount': str(payment.amount),
-                'status': payment.status,
-                'job_uid': payment.job_uid,
-                'timelog_uid': payment.timelog_uid,
-                'payment_date': payment.payment_date.isoformat() if payment.payment_date else None,
-                'created_at': payment.created_at.isoformat(),
+        # Totals cover the whole period, not just the page, and are summed
+        # by the database
+        totals = payments.aggregate(count=Count('uid'), total_amount=Sum('amount'))
+        # SQLite returns SUM() over decimals unscaled; report cents as the
+        # amounts themselves are stored
+        total_amount = str((totals['total_amount'] or Decimal(0)).quantize(CENTS))
+        if _summary_only(request):
+            # No payment rows are fetched
+            return OrjsonResponse({
+                'contractor_id': contractor_id,
+                'date_range': {
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'days_back': days_back
+                },
+                'count': totals['count'],
+                'total_amount': total_amount,
+                'note': 'Query Pattern 3: Latest payment line items for contractor in time period'
             })
-            total_amount += payment.amount
         
-        return JsonResponse({
+        page = _KeysetPage(request, payments)
+        # Only the rendered columns are selected, unpacked from plain
+        # values_list() tuples into the response dicts
+        rows = page.queryset.values_list(*PAYMENT_FIELDS).iterator(chunk_size=2000)
+        payments_data = list(page.track(
+            {
+                'id': business_id,
+                'version': version,
+                'uid': uid,
+                'amount': amount,
+                'status': status,
+                'job_uid': job_uid,
+                'timelog_uid': timelog_uid,
+                'payment_date': payment_date,
+                'created_at': created_at,
+            }
+            for business_id, version, uid, amount, status, job_uid, timelog_uid, payment_date, created_at in rows
+        ))
+        
+        return OrjsonResponse({
             'contractor_id': contractor_id,
             'date_range': {
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
+                'start_date': start_date,
+                'end_date': end_date,
                 'days_back': days_back
             },
             'payments': payments_data,
             'count': len(payments_data),
-            'total_amount': str(total_amount),
+            'next_cursor': page.next_cursor,
+            'total_amount': total_amount,
             'note': 'Query Pattern 3: Latest payment line items for contractor in time period'
         })
+    except _InvalidPage as e:
+        return OrjsonResponse({'error': str(e)}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
+@_conditional(_contractor_dashboard_etag)
 def contractor_dashboard(request, contractor_id):
     """
     Combined dashboard showing all contractor data using SCD abstraction
@@ -289,39 +569,42 @@ def contractor_dashboard(request, contractor_id):
         days_back = int(request.GET.get('days', 30))
         
         # Use SCD abstraction for efficient data retrieval
-        examples = SCDQueryExamples()
-        dashboard_data = examples.get_contractor_dashboard_data(contractor_id, days_back)
+        dashboard_data = query_examples.get_contractor_dashboard_data(contractor_id, days_back)
         
-        # Convert to JSON-serializable format
-        jobs_data = []
-        for job in dashboard_data['jobs']:
-            jobs_data.append({
-                'id': job.id,
-                'version': job.version,
-                'title': job.title,
-                'status': job.status,
-                'rate': str(job.rate),
+        if _summary_only(request):
+            # The hour and amount totals are already database aggregates;
+            # counting the jobs is the only other query
+            return OrjsonResponse({
+                'contractor_id': contractor_id,
+                'period_days': days_back,
+                'summary': {
+                    'total_jobs': dashboard_data['jobs'].count(),
+                    'total_hours': dashboard_data['total_hours'],
+                    'total_amount': str(dashboard_data['total_amount']),
+                },
+                'note': 'Comprehensive contractor dashboard using SCD abstraction'
             })
         
+        # Rows are read as values() dicts and handed to the encoder as-is;
+        # Decimal rates and amounts are stringified inside orjson.dumps()
+        jobs_data = list(
+            dashboard_data['jobs'].values('id', 'version', 'title', 'status', 'rate')
+        )
+        
         timelogs_data = []
-        for timelog in dashboard_data['timelogs']:
+        for row in dashboard_data['timelogs'].values('id', 'version', 'duration', 'type').iterator(chunk_size=2000):
             timelogs_data.append({
-                'id': timelog.id,
-                'version': timelog.version,
-                'duration_hours': round(timelog.duration / (1000 * 60 * 60), 2),
-                'type': timelog.type,
+                'id': row['id'],
+                'version': row['version'],
+                'duration_hours': round(row['duration'] / MS_PER_HOUR, 2),
+                'type': row['type'],
             })
         
-        payments_data = []
-        for payment in dashboard_data['payment_items']:
-            payments_data.append({
-                'id': payment.id,
-                'version': payment.version,
-                'amount': str(payment.amount),
-                'status': payment.status,
-            })
+        payments_data = list(
+            dashboard_data['payment_items'].values('id', 'version', 'amount', 'status')
+        )
         
-        return JsonResponse({
+        return OrjsonResponse({
             'contractor_id': contractor_id,
             'period_days': days_back,
             'summary': {
@@ -335,27 +618,26 @@ def contractor_dashboard(request, contractor_id):
             'note': 'Comprehensive contractor dashboard using SCD abstraction'
         })
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return OrjsonResponse({'error': str(e)}, status=500)
 
 
 @require_http_methods(["GET"])
+@_conditional(_company_report_etag)
 def company_report(request, company_id):
     """
     Company spending report using SCD abstraction
     """
     try:
         # Get month/year from query params
-        month = int(request.GET.get('month', datetime.now().month))
-        year = int(request.GET.get('year', datetime.now().year))
+        month, year = _report_period(request)
         
         # Use SCD abstraction
-        examples = SCDQueryExamples()
-        report_data = examples.get_company_spending_report(company_id, month, year)
+        report_data = query_examples.get_company_spending_report_cached(company_id, month, year)
         
-        return JsonResponse({
+        return OrjsonResponse({
             'company_id': company_id,
             'report': report_data,
             'note': 'Company spending report using SCD abstraction'
         })
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500) 
\ No newline at end of file
+        return OrjsonResponse({'error': str(e)}, status=500) 
\ No newline at end of file
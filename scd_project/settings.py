@@ -29,6 +29,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Compresses API responses for clients sending Accept-Encoding: gzip
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -58,6 +60,8 @@ TEMPLATES = [
 WSGI_APPLICATION = 'scd_project.wsgi.application'
 
 # Database - SQLite for development
+# The SQLite test database is created in memory, so tests pay no journal or
+# fsync cost; run them with `python manage.py test --parallel=4`
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',